@@ -1,3 +1,5 @@
+import functools
+import hashlib
 import os
 import random
 import re
@@ -38,6 +40,10 @@ ICON = "skin"
 ERROR_LOG = f"{BACKUP_BASE_DIR}/error_log.txt"
 LONG_TAIL_FILE = "长尾词.txt"
 
+# 图片内容寻址缓存：按搜索关键词的SHA-1分桶，命中时直接复用本地文件跳过网络下载
+IMAGE_CACHE_DIR = f"{BACKUP_BASE_DIR}/image_cache"
+IMAGE_CACHE_MAX_ENTRIES = 500
+
 # 语言配置
 LANGUAGES = {
     'zh-cn': '简体中文',
@@ -690,10 +696,13 @@ class ArticleGenerator:
         """确保备份目录存在"""
         Path(BACKUP_BASE_DIR).mkdir(parents=True, exist_ok=True)
 
+    @functools.lru_cache(maxsize=4096)
     def sanitize_filename(self, filename):
         """
         清理文件名，确保Windows文件系统兼容性
         保留中文、英文字符，移除特殊字符
+
+        纯函数，按输入字符串做lru_cache缓存，同一标题重复清理时免去逐字符扫描
         """
         if not filename:
             return "untitled"
@@ -847,12 +856,73 @@ class ArticleGenerator:
             print(f"❌ 下载过程异常: {e}")
             return []
 
+    def _image_cache_bucket(self, keyword):
+        """根据搜索关键词的SHA-1计算缓存目录"""
+        key = hashlib.sha1(keyword.encode('utf-8')).hexdigest()
+        return Path(IMAGE_CACHE_DIR) / key
+
+    def _get_cached_images(self, keyword, limit=1):
+        """读取关键词对应的图片缓存，命中时刷新访问时间供LRU淘汰参考"""
+        try:
+            bucket = self._image_cache_bucket(keyword)
+            if not bucket.exists():
+                return []
+            # 跳过.tmp：写入与os.replace之间崩溃留下的半截文件不能当缓存命中
+            files = [f for f in bucket.iterdir()
+                     if f.is_file() and f.suffix != '.tmp' and f.stat().st_size > 1024]
+            if not files:
+                return []
+            os.utime(bucket)
+            return [str(f) for f in files[:limit]]
+        except Exception as e:
+            print(f"⚠️ 读取图片缓存失败: {e}")
+            return []
+
+    def _store_images_in_cache(self, keyword, image_paths):
+        """将下载结果原子写入缓存目录（临时文件+os.replace），并触发LRU淘汰"""
+        try:
+            bucket = self._image_cache_bucket(keyword)
+            bucket.mkdir(parents=True, exist_ok=True)
+            for img_path in image_paths:
+                src = Path(img_path)
+                if not src.exists():
+                    continue
+                dest = bucket / src.name
+                tmp = dest.with_suffix(dest.suffix + '.tmp')
+                with open(src, 'rb') as src_file:
+                    with open(tmp, 'wb') as dst_file:
+                        dst_file.write(src_file.read())
+                os.replace(tmp, dest)
+            self._evict_image_cache()
+        except Exception as e:
+            print(f"⚠️ 写入图片缓存失败: {e}")
+
+    def _evict_image_cache(self):
+        """缓存条目超过上限时，按目录访问时间淘汰最久未使用的关键词"""
+        try:
+            cache_root = Path(IMAGE_CACHE_DIR)
+            buckets = [d for d in cache_root.iterdir() if d.is_dir()]
+            if len(buckets) <= IMAGE_CACHE_MAX_ENTRIES:
+                return
+            import shutil
+            buckets.sort(key=lambda d: d.stat().st_atime)
+            for stale in buckets[:len(buckets) - IMAGE_CACHE_MAX_ENTRIES]:
+                shutil.rmtree(stale, ignore_errors=True)
+        except Exception as e:
+            print(f"⚠️ 清理图片缓存失败: {e}")
+
     def get_images_bing(self, keyword, output_dir, limit=1):
-        """使用Bing图片搜索下载图片（带强制超时保护）"""
+        """使用Bing图片搜索下载图片（带强制超时保护和本地内容寻址缓存）"""
+        # 相同关键词的图片直接复用本地缓存，跳过网络下载
+        cached = self._get_cached_images(keyword, limit)
+        if cached:
+            print(f"📦 图片缓存命中: {keyword} ({len(cached)} 张)")
+            return cached
+
         if not downloader:
             print("无法获取图片：需要安装bing-image-downloader库")
             return []
-        
+
         max_retries = 1  # 只重试1次
         base_timeout = 15  # 基础超时时间
         
@@ -862,8 +932,10 @@ class ArticleGenerator:
             
             try:
                 result = self.get_images_bing_with_timeout(keyword, output_dir, limit, timeout)
-                
+
                 if result:
+                    # 下载成功后写入缓存，下次相同关键词不再走网络
+                    self._store_images_in_cache(keyword, result)
                     return result
                     
                 # 清理可能的部分下载文件
@@ -1,7 +1,10 @@
+import hashlib
 import os
 import shutil
 import subprocess
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 import json
@@ -11,6 +14,18 @@ from urllib.parse import urlsplit, urlunsplit, quote, parse_qsl, urlencode
 # 定义北京时间时区
 beijing_tz = timezone(timedelta(hours=8))
 
+# 匹配指向本地images目录的Markdown图片引用，如 ![xxx](./images/xxx.png)
+_IMG_PATH_RE = re.compile(r'!\[([^\]]*)\]\([^)]*images/([^)]+)\)')
+
+
+def _hash_image_file(path):
+    """分块计算图片内容的blake2b指纹，避免把大文件整读进内存"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 class ImageUploadManager:
     """图片上传管理器，负责将图片上传到图床仓库并返回远程URL"""
     
@@ -208,6 +223,91 @@ class ImageUploadManager:
                 'upload_time': datetime.now(beijing_tz).isoformat()
             }
     
+    def _stage_article_images(self, article_data, repo_path, image_repo_config, repo_url, branch, domain,
+                              dedup_cache=None, dedup_lock=None):
+        """收集并复制单篇文章的图片到图床工作区（批量上传的并行工作单元）
+
+        dedup_cache为批次级的 内容指纹->远程URL 缓存：同一张图片（如各语言
+        版本共用的截图）整个批次只上传一个副本，其余直接复用URL。
+        """
+        article_path = Path(article_data['original_path'])
+        article_info = article_data['article_data']
+        images_dir = article_path / "images"
+
+        if not images_dir.exists():
+            print(f"      ⚠️  文章 {article_info['folder_name']} 没有图片")
+            return article_info['folder_name'], []
+
+        # 收集图片文件
+        image_files = []
+        for ext in ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp']:
+            image_files.extend(images_dir.glob(ext))
+
+        if not image_files:
+            print(f"      ⚠️  文章 {article_info['folder_name']} 没有找到图片文件")
+            return article_info['folder_name'], []
+
+        print(f"      📸 处理文章 {article_info['folder_name']} 的 {len(image_files)} 张图片...")
+
+        # 生成目标路径
+        target_base_path = self.generate_image_target_path(image_repo_config, article_info)
+        target_path = repo_path / target_base_path
+        target_path.mkdir(parents=True, exist_ok=True)
+
+        article_uploaded_images = []
+
+        # 上传每个图片文件
+        for image_file in image_files:
+            if not image_file.exists():
+                continue
+
+            # 获取文件名
+            filename = image_file.name
+
+            # 批次内内容去重：同样的字节只上传一次
+            content_hash = None
+            if dedup_cache is not None:
+                content_hash = _hash_image_file(image_file)
+                with dedup_lock:
+                    cached_url = dedup_cache.get(content_hash)
+                if cached_url:
+                    article_uploaded_images.append({
+                        'local_path': str(image_file),
+                        'filename': filename,
+                        'remote_url': cached_url,
+                        'target_path': '',
+                        'deduplicated': True
+                    })
+                    continue
+
+            # 复制图片到目标目录
+            target_file = target_path / filename
+            shutil.copy2(image_file, target_file)
+
+            # 生成远程URL
+            if domain:
+                remote_url = f"https://{domain}/{target_base_path}/{filename}"
+            else:
+                # 如果没有配置域名，使用GitHub raw URL
+                repo_name = repo_url.split('/')[-1].replace('.git', '')
+                owner = repo_url.split('/')[-2]
+                remote_url = f"https://raw.githubusercontent.com/{owner}/{repo_name}/{branch}/{target_base_path}/{filename}"
+
+            if content_hash is not None:
+                with dedup_lock:
+                    dedup_cache[content_hash] = remote_url
+
+            article_uploaded_images.append({
+                'local_path': str(image_file),
+                'filename': filename,
+                'remote_url': remote_url,
+                'target_path': str(target_file)
+            })
+
+        if article_uploaded_images:
+            print(f"      ✅ 文章 {article_info['folder_name']} 图片准备完成: {len(article_uploaded_images)} 张")
+        return article_info['folder_name'], article_uploaded_images
+
     def batch_upload_articles_images(self, articles_data, repo_id, is_final_commit=False):
         """批量上传多篇文章的图片到图床仓库"""
         try:
@@ -246,66 +346,23 @@ class ImageUploadManager:
                     'git', 'config', 'user.name', 'Action'
                 ], cwd=repo_path, check=True)
                 
-                # 处理每篇文章的图片
-                for article_data in articles_data:
-                    article_path = Path(article_data['original_path'])
-                    article_info = article_data['article_data']
-                    images_dir = article_path / "images"
-                    
-                    if not images_dir.exists():
-                        print(f"      ⚠️  文章 {article_info['folder_name']} 没有图片")
-                        continue
-                    
-                    # 收集图片文件
-                    image_files = []
-                    for ext in ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp']:
-                        image_files.extend(images_dir.glob(ext))
-                    
-                    if not image_files:
-                        print(f"      ⚠️  文章 {article_info['folder_name']} 没有找到图片文件")
-                        continue
-                    
-                    print(f"      📸 处理文章 {article_info['folder_name']} 的 {len(image_files)} 张图片...")
-                    
-                    # 生成目标路径
-                    target_base_path = self.generate_image_target_path(image_repo_config, article_info)
-                    target_path = repo_path / target_base_path
-                    target_path.mkdir(parents=True, exist_ok=True)
-                    
-                    article_uploaded_images = []
-                    
-                    # 上传每个图片文件
-                    for image_file in image_files:
-                        if not image_file.exists():
-                            continue
-                        
-                        # 获取文件名
-                        filename = image_file.name
-                        
-                        # 复制图片到目标目录
-                        target_file = target_path / filename
-                        shutil.copy2(image_file, target_file)
-                        
-                        # 生成远程URL
-                        if domain:
-                            remote_url = f"https://{domain}/{target_base_path}/{filename}"
-                        else:
-                            # 如果没有配置域名，使用GitHub raw URL
-                            repo_name = repo_url.split('/')[-1].replace('.git', '')
-                            owner = repo_url.split('/')[-2]
-                            remote_url = f"https://raw.githubusercontent.com/{owner}/{repo_name}/{branch}/{target_base_path}/{filename}"
-                        
-                        article_uploaded_images.append({
-                            'local_path': str(image_file),
-                            'filename': filename,
-                            'remote_url': remote_url,
-                            'target_path': str(target_file)
-                        })
-                    
-                    if article_uploaded_images:
-                        all_uploaded_images[article_info['folder_name']] = article_uploaded_images
-                        total_images += len(article_uploaded_images)
-                        print(f"      ✅ 文章 {article_info['folder_name']} 图片准备完成: {len(article_uploaded_images)} 张")
+                # 批次级内容寻址缓存：跨文章去重相同图片
+                dedup_cache = {}
+                dedup_lock = threading.Lock()
+
+                # 图片复制是纯磁盘I/O，按文章并行staging到图床工作区
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    futures = [
+                        executor.submit(self._stage_article_images, article_data,
+                                        repo_path, image_repo_config, repo_url, branch, domain,
+                                        dedup_cache, dedup_lock)
+                        for article_data in articles_data
+                    ]
+                    for future in as_completed(futures):
+                        folder_name, article_uploaded_images = future.result()
+                        if article_uploaded_images:
+                            all_uploaded_images[folder_name] = article_uploaded_images
+                            total_images += len(article_uploaded_images)
                 
                 if not all_uploaded_images:
                     return {
@@ -372,38 +429,31 @@ class ImageUploadManager:
             }
 
     def replace_images_with_remote_urls(self, text, image_mapping):
-        """将文章中的图片路径替换为远程URL"""
+        """将文章中的图片路径替换为远程URL（预编译正则单次扫描）"""
         if not image_mapping:
             return text
-        
-        result_text = text
+
+        # 文件名到远程URL的查表，替换回调里O(1)命中
+        url_map = {img_info['filename']: img_info['remote_url'] for img_info in image_mapping}
         replaced_count = 0
-        
-        # 匹配所有图片路径模式
-        patterns = [
-            r'!\[([^\]]*)\]\(\./images/([^)]+)\)',  # ![xxx](./images/xxx)
-            r'!\[([^\]]*)\]\([^)]*images/([^)]+)\)',  # 任何包含images/的路径
-        ]
-        
-        for pattern in patterns:
-            def replace_func(match):
-                nonlocal replaced_count
-                alt_text = match.group(1)
-                filename = match.group(2)
-                
-                # 查找对应的远程URL
-                for img_info in image_mapping:
-                    if img_info['filename'] == filename:
-                        replaced_count += 1
-                        print(f"[REPLACE] 替换图片路径: {filename} -> {img_info['remote_url']}")
-                        safe_url = self._sanitize_url(img_info["remote_url"])
-                        return f'![{alt_text}]({safe_url})'
-                
+
+        def replace_func(match):
+            nonlocal replaced_count
+            alt_text = match.group(1)
+            filename = match.group(2)
+
+            remote_url = url_map.get(filename)
+            if remote_url is None:
                 # 如果没有找到对应的远程URL，保持原样
                 return match.group(0)
-            
-            result_text = re.sub(pattern, replace_func, result_text)
-        
+
+            replaced_count += 1
+            print(f"[REPLACE] 替换图片路径: {filename} -> {remote_url}")
+            safe_url = self._sanitize_url(remote_url)
+            return f'![{alt_text}]({safe_url})'
+
+        result_text = _IMG_PATH_RE.sub(replace_func, text)
+
         print(f"[REPLACE] 已替换 {replaced_count} 个图片路径为远程URL")
         return result_text
     
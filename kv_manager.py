@@ -1,11 +1,12 @@
 import requests
 
-def kv_read(account_id: str, namespace_id: str, api_token: str, key: str):
+def kv_read(account_id: str, namespace_id: str, api_token: str, key: str, session=None):
     url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/storage/kv/namespaces/{namespace_id}/values/{key}"
     headers = {
         "Authorization": f"Bearer {api_token}",
     }
-    response = requests.get(url, headers=headers)
+    http = session or requests
+    response = http.get(url, headers=headers)
     if response.status_code == 200:
         return response.text
     elif response.status_code == 404:
@@ -18,13 +19,16 @@ def kv_read(account_id: str, namespace_id: str, api_token: str, key: str):
         except Exception:
             return {"error": response.text, "status": response.status_code}
 
-def kv_write(account_id: str, namespace_id: str, api_token: str, key: str, value: str):
+def kv_write(account_id: str, namespace_id: str, api_token: str, key: str, value: str, expiration_ttl: int = None, session=None):
     url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/storage/kv/namespaces/{namespace_id}/values/{key}"
+    if expiration_ttl:
+        url += f"?expiration_ttl={int(expiration_ttl)}"
     headers = {
         "Authorization": f"Bearer {api_token}",
         "Content-Type": "text/plain",
     }
-    response = requests.put(url, headers=headers, data=value)
+    http = session or requests
+    response = http.put(url, headers=headers, data=value)
     if response.status_code == 200:
         return {"success": True}
     elif response.status_code == 401 or response.status_code == 403:
@@ -35,12 +39,35 @@ def kv_write(account_id: str, namespace_id: str, api_token: str, key: str, value
         except Exception:
             return {"error": response.text, "status": response.status_code}
 
-def kv_delete(account_id: str, namespace_id: str, api_token: str, key: str):
+def kv_list_keys(account_id: str, namespace_id: str, api_token: str, prefix: str = None, session=None):
+    url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/storage/kv/namespaces/{namespace_id}/keys"
+    headers = {
+        "Authorization": f"Bearer {api_token}",
+    }
+    params = {}
+    if prefix:
+        params["prefix"] = prefix
+    http = session or requests
+    keys = []
+    while True:
+        response = http.get(url, headers=headers, params=params)
+        if response.status_code != 200:
+            break
+        data = response.json()
+        keys.extend(item["name"] for item in data.get("result", []))
+        cursor = data.get("result_info", {}).get("cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+    return keys
+
+def kv_delete(account_id: str, namespace_id: str, api_token: str, key: str, session=None):
     url = f"https://api.cloudflare.com/client/v4/accounts/{account_id}/storage/kv/namespaces/{namespace_id}/values/{key}"
     headers = {
         "Authorization": f"Bearer {api_token}",
     }
-    response = requests.delete(url, headers=headers)
+    http = session or requests
+    response = http.delete(url, headers=headers)
     if response.status_code == 200:
         return {"success": True}
     elif response.status_code == 404:
@@ -1,7 +1,19 @@
 import json
+try:
+    import orjson  # C实现的JSON序列化，比stdlib快数倍
+except ImportError:
+    orjson = None
+import logging
+import logging.handlers
+import sys
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from kv_manager import kv_read, kv_write
+from kv_manager import kv_read, kv_write, kv_delete, kv_list_keys
 from config_manager import ConfigManager
 from article_generator import ArticleGenerator
 from api_manager import MultiPlatformApiManager, ApiExhaustedRetriesError
@@ -10,11 +22,64 @@ from parallel_article_generator import ParallelArticleGenerator
 # 定义北京时间时区
 beijing_tz = timezone(timedelta(hours=8))
 
+
+class TokenBucket:
+    """线程安全的令牌桶限流器
+
+    按固定速率补充令牌，允许不超过桶容量的突发请求；只有令牌耗尽时才等待，
+    用于替代固定的 time.sleep 串行节流。
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)          # 每秒补充的令牌数
+        self.capacity = float(capacity)  # 桶容量（允许的突发量）
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """阻塞直到取得指定数量的令牌"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# 翻译API限流器：每秒5个请求，允许5个突发
+_translate_limiter = TokenBucket(rate=5, capacity=5)
+
+# 发布循环日志：经MemoryHandler缓冲后批量写stdout，循环边界处显式flush，
+# 配合%延迟格式化减少热循环里的字符串拼接和逐条写入开销
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(logging.Formatter('%(message)s'))
+_memory_handler = logging.handlers.MemoryHandler(capacity=100, flushLevel=logging.ERROR, target=_stream_handler)
+logger = logging.getLogger('publish_manager')
+logger.setLevel(logging.INFO)
+logger.addHandler(_memory_handler)
+logger.propagate = False
+
+
 class PublishManager:
     """发布管理器，负责按排名顺序发布文章到不同网站"""
     
     def __init__(self, config_manager=None):
         self.config_manager = config_manager or ConfigManager()
+
+        # 复用带连接池的HTTP会话，所有KV请求共享连接，避免每次请求重新握手
+        self.http = requests.Session()
+        _adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        )
+        self.http.mount('https://', _adapter)
+
         self.api_manager = MultiPlatformApiManager(self.config_manager)
         self.article_generator = ArticleGenerator(self.config_manager, self.api_manager)
         
@@ -30,6 +95,14 @@ class PublishManager:
         enabled_repos = self.article_generator.repo_manager.get_enabled_repositories()
         git_repos = {k: v for k, v in enabled_repos.items() if v['type'] == 'git'}
         self.total_sites = len(git_repos)
+
+        # 本次运行已写入、待全量落盘后清理的标题增量记录键
+        self._pending_delta_keys = set()
+
+        # 缓存Git仓库排序结果和名称映射，避免每次查询时重复扫描仓库配置
+        self._git_repos_sorted = sorted(git_repos.items())
+        self._repo_name_to_index = {v['name']: i for i, (k, v) in enumerate(self._git_repos_sorted)}
+        self._repo_by_name = {v['name']: (k, v) for k, v in self._git_repos_sorted}
         
         # 如果配置文件中指定了total_sites且大于0，则使用配置文件的值（向后兼容）
         config_total_sites = self.publish_config.get('total_sites', 0)
@@ -64,6 +137,66 @@ class PublishManager:
         if self.parallel_enabled:
             print(f"  - 批处理大小: {self.batch_size}")
     
+    # 熔断状态在KV中的存储键与冷却时长（秒）
+    BREAKER_KV_KEY = "circuit_breaker:publish"
+    BREAKER_COOLDOWN_SECONDS = 1800
+
+    # 单次运行内的熔断参数：连续失败达到阈值后打开熔断；
+    # 循环内推迟标题是瞬时的，按推迟数量（而非时间）放行half-open探测
+    BREAKER_FAILURE_THRESHOLD = 3
+    BREAKER_PROBE_DEFER_COUNT = 20
+
+    def _load_breaker_state(self):
+        """从KV读取持久化的熔断状态，读取失败视为无状态"""
+        try:
+            state_str = kv_read(self.account_id, self.namespace_id, self.api_token, self.BREAKER_KV_KEY, session=self.http)
+            if isinstance(state_str, str) and state_str:
+                return json.loads(state_str)
+        except Exception as e:
+            print(f"⚠️ 读取熔断状态失败: {str(e)}")
+        return None
+
+    def _save_breaker_state(self, state, failure_count=0):
+        """将熔断状态写入KV，供下一次cron运行快速判断"""
+        try:
+            now_iso = datetime.now(beijing_tz).isoformat()
+            payload = {
+                'state': state,
+                'opened_at': now_iso if state == 'open' else None,
+                'failure_count': failure_count,
+                'updated_at': now_iso
+            }
+            kv_write(self.account_id, self.namespace_id, self.api_token,
+                     self.BREAKER_KV_KEY, json.dumps(payload, ensure_ascii=False), session=self.http)
+        except Exception as e:
+            print(f"⚠️ 保存熔断状态失败: {str(e)}")
+
+    def _check_persistent_breaker(self):
+        """发布开始前检查跨运行的熔断状态
+
+        熔断处于open且在冷却期内时直接抛出异常快速失败，避免对仍然故障的
+        上游API浪费整轮重试；冷却期已过则转为half-open，允许本次运行作为探测。
+        """
+        state = self._load_breaker_state()
+        if not state or state.get('state') != 'open':
+            return
+
+        opened_at = state.get('opened_at')
+        try:
+            opened_time = datetime.fromisoformat(opened_at)
+        except (TypeError, ValueError):
+            return
+
+        elapsed = (datetime.now(beijing_tz) - opened_time).total_seconds()
+        if elapsed < self.BREAKER_COOLDOWN_SECONDS:
+            remaining = int(self.BREAKER_COOLDOWN_SECONDS - elapsed)
+            raise ApiExhaustedRetriesError(
+                f"🔥 熔断器处于打开状态（剩余冷却 {remaining} 秒），跳过本次发布"
+            )
+
+        print("🔍 熔断冷却期已过，转为半开状态，允许本次运行探测API恢复情况")
+        self._save_breaker_state('half-open', state.get('failure_count', 0))
+
     def find_latest_kv_data(self, max_days_back=30):
         """查找KV存储中最新存在的数据"""
         from datetime import timedelta
@@ -76,7 +209,7 @@ class PublishManager:
             kv_key = f"qimai_data_{date_str}"
             
             print(f"🔍 检查日期: {date_str} (key: {kv_key})")
-            data_str = kv_read(self.account_id, self.namespace_id, self.api_token, kv_key)
+            data_str = kv_read(self.account_id, self.namespace_id, self.api_token, kv_key, session=self.http)
             
             if data_str:
                 print(f"✅ 找到数据: {date_str}")
@@ -145,23 +278,16 @@ class PublishManager:
     def _count_today_published_by_repo(self, repo_name):
         """从远程仓库统计某个仓库今天已发布的文章数量（按文章文件夹计数）"""
         try:
-            # 获取启用的仓库配置
-            enabled_repos = self.article_generator.repo_manager.get_enabled_repositories()
-            git_repos = {k: v for k, v in enabled_repos.items() if v['type'] == 'git'}
-            
-            # 查找对应的仓库配置
-            target_repo_config = None
-            for repo_id, repo_config in git_repos.items():
-                if repo_config.get('name') == repo_name:
-                    target_repo_config = repo_config
-                    break
-            
-            if not target_repo_config:
+            # 使用缓存的名称映射直接查找仓库配置（O(1)）
+            entry = self._repo_by_name.get(repo_name)
+            if entry is None:
                 print(f"⚠️ 未找到仓库配置: {repo_name}")
                 return 0
-            
+            repo_id, target_repo_config = entry
+
             # 使用RepositoryManager查询远程仓库文件夹数量
-            folder_count = self.article_generator.repo_manager.query_remote_repository_folders(target_repo_config)
+            folder_count = self.article_generator.repo_manager.query_remote_repository_folders(
+                target_repo_config, repo_id=repo_id)
             print(f"📊 远程仓库 {repo_name} 今天已发布文章数量: {folder_count}")
             return folder_count
             
@@ -193,19 +319,13 @@ class PublishManager:
         return site_index
     
     def get_repository_for_site(self, site_index):
-        """根据网站索引获取对应的仓库配置"""
-        enabled_repos = self.article_generator.repo_manager.get_enabled_repositories()
-        git_repos = {k: v for k, v in enabled_repos.items() if v['type'] == 'git'}
-        
-        if not git_repos:
+        """根据网站索引获取对应的仓库配置（使用初始化时缓存的排序结果）"""
+        if not self._git_repos_sorted:
             print("❌ 没有找到启用的Git仓库")
             return None
-        
-        # 将仓库按ID排序，确保一致性
-        sorted_repos = sorted(git_repos.items())
-        
-        if site_index < len(sorted_repos):
-            repo_id, repo_config = sorted_repos[site_index]
+
+        if site_index < len(self._git_repos_sorted):
+            repo_id, repo_config = self._git_repos_sorted[site_index]
             print(f"📁 网站 {site_index} 对应仓库: {repo_config['name']}")
             return repo_id, repo_config
         else:
@@ -235,14 +355,27 @@ class PublishManager:
         print("=== 开始每日文章发布 ===")
         print(f"🎯 目标: 每个网站发布 {actual_articles_per_site} 篇文章")
         print(f"🌐 总网站数: {self.total_sites}")
-        
+
+        # 检查跨运行持久化的熔断状态（冷却期内直接快速失败）
+        self._check_persistent_breaker()
+
         # 根据配置选择并行或串行模式
-        if self.parallel_enabled:
-            print("🚀 使用并行生成模式")
-            return self.publish_daily_articles_parallel(need_images, actual_articles_per_site, max_workers, batch_size)
-        else:
-            print("🔄 使用串行生成模式")
-            return self.publish_daily_articles_serial(need_images, actual_articles_per_site)
+        try:
+            if self.parallel_enabled:
+                print("🚀 使用并行生成模式")
+                success = self.publish_daily_articles_parallel(need_images, actual_articles_per_site, max_workers, batch_size)
+            else:
+                print("🔄 使用串行生成模式")
+                success = self.publish_daily_articles_serial(need_images, actual_articles_per_site)
+        except ApiExhaustedRetriesError:
+            # 熔断触发，持久化open状态供下次cron运行快速失败
+            prev_state = self._load_breaker_state() or {}
+            self._save_breaker_state('open', prev_state.get('failure_count', 0) + 1)
+            raise
+
+        # 正常跑完整个发布流程，关闭熔断器
+        self._save_breaker_state('closed')
+        return success
     
     def publish_daily_articles_parallel(self, need_images=True, articles_per_site=100, max_workers=None, batch_size=None):
         """执行每日文章发布 - 并行版本"""
@@ -265,7 +398,10 @@ class PublishManager:
             return False
         
         processed_data = json.loads(existing_data_str)
-        
+
+        # 合并上次运行遗留的单标题增量记录，避免重复发布已用过的标题
+        self._merge_title_deltas(kv_key, processed_data)
+
         # 按排名获取所有未使用的标题，并随机打乱顺序进行发布
         all_titles = self.get_all_unused_titles_by_rank(processed_data)
         import random
@@ -316,130 +452,142 @@ class PublishManager:
             # 检查是否还有网站需要文章
             available_sites = [i for i in range(self.total_sites) if site_stats[i]['published'] < site_stats[i]['target']]
             if not available_sites:
-                print("✅ 所有网站均已达到当日目标")
+                logger.info("✅ 所有网站均已达到当日目标")
                 break
-            
+
             # 随机选择一个需要文章的网站
             import random
             target_site = random.choice(available_sites)
-            
+
             # 获取目标仓库信息
             repo_info = self.get_repository_for_site(target_site)
             if not repo_info:
-                print(f"❌ 无法获取网站 {target_site} 的仓库配置")
+                logger.info("❌ 无法获取网站 %s 的仓库配置", target_site)
                 site_stats[target_site]['failed'] += 1
                 continue
-            
+
             repo_id, repo_config = repo_info
-            
+
             # 计算该网站还需要多少篇文章
             remaining_articles = site_stats[target_site]['target'] - site_stats[target_site]['published']
             if remaining_articles <= 0:
-                print(f"✅ 网站 {target_site} 已达到目标数量")
+                logger.info("✅ 网站 %s 已达到目标数量", target_site)
                 continue
-            
+
             # 确定本批次要处理的文章数量（不超过批处理大小和剩余需求）
             batch_size_for_site = min(self.batch_size, remaining_articles)
-            
+
             # 从可用标题中选择本批次要处理的标题
             batch_titles = []
             for title_info in titles_to_publish:
                 if len(batch_titles) >= batch_size_for_site:
                     break
-                    
+
                 title_text = title_info['title_obj'].get('title', '')
                 if title_text not in used_titles_today:
                     batch_titles.append(title_info)
                     used_titles_today.add(title_text)
-            
+
             if not batch_titles:
-                print("⏭️ 没有可用的标题")
+                logger.info("⏭️ 没有可用的标题")
                 break
-            
-            print(f"\n📦 处理网站 {target_site} ({repo_config['name']}): {len(batch_titles)} 个任务")
-            print(f"   目标: {site_stats[target_site]['target']} 篇, 已发布: {site_stats[target_site]['published']} 篇, 剩余: {remaining_articles} 篇")
-            
+
+            logger.info("\n📦 处理网站 %s (%s): %s 个任务", target_site, repo_config['name'], len(batch_titles))
+            logger.info("   目标: %s 篇, 已发布: %s 篇, 剩余: %s 篇",
+                        site_stats[target_site]['target'], site_stats[target_site]['published'], remaining_articles)
+
             # 创建并行生成任务
             article_tasks = self.parallel_generator.create_article_tasks(
-                batch_titles, 
-                need_images, 
+                batch_titles,
+                need_images,
                 repo_config.get('name'),
                 repo_config
             )
-            
-            print(f"🚀 开始并行生成 {len(article_tasks)} 个文章到网站 {target_site}...")
-            
+
+            logger.info("🚀 开始并行生成 %s 个文章到网站 %s...", len(article_tasks), target_site)
+            # 进入会直接print的生成流程前先刷出缓冲，保证头部日志在详细输出之前
+            _memory_handler.flush()
+
             try:
                 # 并行生成文章
                 generation_results = self.parallel_generator.generate_articles_parallel(article_tasks)
-                
+
                 # 收集成功生成的文章
                 successful_articles = []
                 failed_count = 0
-                
+
                 for result in generation_results:
                     if result['success']:
                         successful_articles.append(result)
-                        print(f"   ✅ 文章 #{result['task_id']} 生成成功: {result['keyword']}")
+                        logger.info("   ✅ 文章 #%s 生成成功: %s", result['task_id'], result['keyword'])
                     else:
                         failed_count += 1
-                        print(f"   ❌ 文章 #{result['task_id']} 生成失败: {result.get('error', '未知错误')}")
-                        
+                        logger.info("   ❌ 文章 #%s 生成失败: %s", result['task_id'], result.get('error', '未知错误'))
+
                         # 检查是否是API重试耗尽错误
                         if result.get('error_type') == 'api_exhausted':
-                            print("⛔ 检测到API重试耗尽错误，触发熔断机制")
+                            logger.info("⛔ 检测到API重试耗尽错误，触发熔断机制")
                             circuit_breaker_triggered = True
                             break
-                
+
                 # 如果有成功生成的文章，上传到目标网站
                 if successful_articles and not circuit_breaker_triggered:
-                    print(f"\n📤 开始上传 {len(successful_articles)} 篇文章到网站 {target_site}...")
-                    
+                    logger.info("\n📤 开始上传 %s 篇文章到网站 %s...", len(successful_articles), target_site)
+
                     # 判断是否为该网站的最后一次上传
                     articles_to_publish_count = len(successful_articles)
                     is_final_commit_for_site = (site_stats[target_site]['published'] + articles_to_publish_count >= site_stats[target_site]['target'])
-                    
+
                     if is_final_commit_for_site:
-                        print(f"🚀 这是网站 {target_site} 的最后一次提交，将触发自动部署")
+                        logger.info("🚀 这是网站 %s 的最后一次提交，将触发自动部署", target_site)
                     else:
-                        print(f"📝 普通提交到网站 {target_site}，跳过自动部署")
-                    
+                        logger.info("📝 普通提交到网站 %s，跳过自动部署", target_site)
+                    # 上传流程同样直接print，刷出缓冲保持顺序
+                    _memory_handler.flush()
+
                     # 批量上传所有成功的文章
                     batch_upload_success = self._batch_upload_articles(
-                        successful_articles, target_site, repo_id, repo_config, 
+                        successful_articles, target_site, repo_id, repo_config,
                         is_final_commit_for_site, kv_key, processed_data, batch_titles
                     )
-                    
+
                     if batch_upload_success:
                         # 更新统计信息
                         site_stats[target_site]['published'] += len(successful_articles)
                         total_published += len(successful_articles)
-                        print(f"✅ 上传成功: {len(successful_articles)} 篇文章已发布到网站 {target_site}")
-                        print(f"   网站 {target_site} 进度: {site_stats[target_site]['published']}/{site_stats[target_site]['target']}")
+                        logger.info("✅ 上传成功: %s 篇文章已发布到网站 %s", len(successful_articles), target_site)
+                        logger.info("   网站 %s 进度: %s/%s", target_site,
+                                    site_stats[target_site]['published'], site_stats[target_site]['target'])
                     else:
                         site_stats[target_site]['failed'] += len(successful_articles)
                         total_failed += len(successful_articles)
-                        print(f"❌ 上传失败")
-                
+                        logger.info("❌ 上传失败")
+
                 # 更新失败统计
                 site_stats[target_site]['failed'] += failed_count
                 total_failed += failed_count
-                
+
                 # 检查是否触发熔断机制
                 if circuit_breaker_triggered:
-                    print("⛔ 熔断机制已触发，停止处理")
+                    logger.info("⛔ 熔断机制已触发，停止处理")
                     break
-                
+
             except ApiExhaustedRetriesError as e:
-                print(f"💥 网站 {target_site} 处理中发生API重试耗尽异常: {str(e)}")
+                logger.info("💥 网站 %s 处理中发生API重试耗尽异常: %s", target_site, str(e))
                 circuit_breaker_triggered = True
                 break
             except Exception as e:
-                print(f"❌ 网站 {target_site} 处理异常: {str(e)}")
+                logger.info("❌ 网站 %s 处理异常: %s", target_site, str(e))
                 site_stats[target_site]['failed'] += len(batch_titles)
                 total_failed += len(batch_titles)
                 continue
-        
+            finally:
+                # 每个批次结束后把缓冲的日志批量刷出
+                _memory_handler.flush()
+
+        # 循环退出后刷掉最后一批缓冲日志，避免与后续print输出乱序
+        _memory_handler.flush()
+
         # 检查是否触发了熔断机制
         if circuit_breaker_triggered:
             print("\n🔥 熔断机制已触发，停止文章发布流程")
@@ -453,11 +601,13 @@ class PublishManager:
         print(f"  - 总发布失败: {total_failed}")
         
         print(f"\n📈 各网站统计:")
+        # 一次性取出所有网站的仓库信息，避免在打印循环里重复查询
+        repo_infos = [self.get_repository_for_site(i) for i in range(self.total_sites)]
         for site_index in range(self.total_sites):
             stats = site_stats[site_index]
-            repo_info = self.get_repository_for_site(site_index)
+            repo_info = repo_infos[site_index]
             repo_name = repo_info[1]['name'] if repo_info else f"网站{site_index}"
-            
+
             print(f"  - {repo_name}: {stats['published']}/{stats['target']} 成功, {stats['failed']} 失败")
         
         # 检查是否所有网站都达到了目标数量
@@ -478,6 +628,9 @@ class PublishManager:
         """批量上传文章到指定网站 - 所有文章一次性提交"""
         try:
             print(f"   📤 准备批量上传 {len(successful_articles)} 篇文章到 {repo_config['name']}")
+
+            # 同一批次的文章使用同一个时间戳，避免逐标题重复取时间和格式化
+            batch_stamp = datetime.now(beijing_tz).isoformat()
             
             # 收集所有文章的文件路径，准备批量上传
             all_article_paths = []
@@ -534,7 +687,7 @@ class PublishManager:
                     if title_info:
                         title_obj = title_info['title_obj']
                         title_obj['use_count'] = title_obj.get('use_count', 0) + 1
-                        title_obj['last_used_at'] = datetime.now(beijing_tz).isoformat()
+                        title_obj['last_used_at'] = batch_stamp
                         title_obj['published_to_site'] = target_site
                         title_obj['published_to_repo'] = repo_id
                         title_obj['was_final_commit'] = is_final_commit
@@ -625,7 +778,10 @@ class PublishManager:
             return False
         
         processed_data = json.loads(existing_data_str)
-        
+
+        # 合并上次运行遗留的单标题增量记录，避免重复发布已用过的标题
+        self._merge_title_deltas(kv_key, processed_data)
+
         # 按排名获取所有未使用的标题，并随机打乱顺序进行发布
         all_titles = self.get_all_unused_titles_by_rank(processed_data)
         import random
@@ -653,75 +809,106 @@ class PublishManager:
         
         total_published = 0
         total_failed = 0
-        
+
         # 确保同一标题不会在多个网站重复发布（本次运行内）
         used_titles_today = set()
-        
-        # 熔断标志
-        circuit_breaker_triggered = False
+
+        # 三态熔断：closed正常、open跳过标题、half-open放行一次探测请求
+        consecutive_failures = 0
+        breaker_open = False
+        breaker_half_open = False
+        deferred_count = 0
+        deferred_since_open = 0
+
+        # KV写入合并：循环内只标记脏位，按checkpoint间隔与循环结束时统一落盘
+        kv_dirty = False
+        KV_CHECKPOINT_INTERVAL = 10
+
+        # 增量维护已达标的网站集合，免去每轮对全部网站的重复扫描
+        sites_reached = {i for i in range(self.total_sites)
+                         if site_stats[i]['published'] >= site_stats[i]['target']}
 
         # 逐个标题尝试发布（随机分配到有剩余额度的网站）
         for title_index, title_info in enumerate(all_titles):
-            # 检查熔断状态
-            if circuit_breaker_triggered:
-                print("⛔ 熔断机制已触发，停止处理剩余标题")
-                break
+            # 检查熔断状态：熔断打开时跳过标题（留给下次运行），
+            # 每推迟满N个标题放行一次探测，避免一次短暂故障推迟整个批次
+            if breaker_open:
+                deferred_since_open += 1
+                if deferred_since_open % self.BREAKER_PROBE_DEFER_COUNT != 0:
+                    deferred_count += 1
+                    continue
+                breaker_half_open = True
+                logger.info("🔎 已推迟 %s 个标题，放行一次探测请求", deferred_since_open)
             # 检查是否已达到目标数量
-            if all(site_stats[i]['published'] >= site_stats[i]['target'] for i in range(self.total_sites)):
-                print(f"✅ 所有网站已达到目标发布数量")
+            if len(sites_reached) == self.total_sites:
+                logger.info("✅ 所有网站已达到目标发布数量")
                 break
-            
+
             title_text = title_info['title_obj'].get('title', '')
             # 保证标题在本次运行中不重复到两个平台
             if title_text in used_titles_today:
                 continue
-            
+
             # 从尚未达标的网站中随机选择一个
             available_sites = [i for i in range(self.total_sites) if site_stats[i]['published'] < site_stats[i]['target']]
             if not available_sites:
-                print("✅ 所有网站均已达到当日目标")
+                logger.info("✅ 所有网站均已达到当日目标")
                 break
             import random
             target_site = random.choice(available_sites)
-            
+
             # 检查目标网站是否已达到发布数量
             if site_stats[target_site]['published'] >= site_stats[target_site]['target']:
-                print(f"⏭️ 网站 {target_site} 已达到目标数量，跳过标题序号 {title_index}")
+                logger.info("⏭️ 网站 %s 已达到目标数量，跳过标题序号 %s", target_site, title_index)
                 continue
-            
+
             # 获取目标仓库
             repo_info = self.get_repository_for_site(target_site)
             if not repo_info:
-                print(f"❌ 无法获取网站 {target_site} 的仓库配置")
+                logger.info("❌ 无法获取网站 %s 的仓库配置", target_site)
                 continue
-            
+
             repo_id, repo_config = repo_info
-            
+
             # 判断是否为该网站的最后一次上传
             is_final_commit_for_site = (site_stats[target_site]['published'] + 1 == site_stats[target_site]['target'])
-            
-            print(f"\n📝 发布文章到网站 {target_site} ({repo_config['name']})")
-            print(f"   标题序号: {title_index}, 关键词: {title_info['keyword']} (排名: {title_info['keyword_rank']})")
-            print(f"   标题: {title_info['title_obj']['title']}")
-            print(f"   进度: {site_stats[target_site]['published']}/{site_stats[target_site]['target']}")
-            print(f"   部署状态: {'🚀 最后一次提交，将触发自动部署' if is_final_commit_for_site else '📝 普通提交，跳过自动部署'}")
-            
+
+            logger.info("\n📝 发布文章到网站 %s (%s)", target_site, repo_config['name'])
+            logger.info("   标题序号: %s, 关键词: %s (排名: %s)", title_index, title_info['keyword'], title_info['keyword_rank'])
+            logger.info("   标题: %s", title_info['title_obj']['title'])
+            logger.info("   进度: %s/%s", site_stats[target_site]['published'], site_stats[target_site]['target'])
+            logger.info("   部署状态: %s", '🚀 最后一次提交，将触发自动部署' if is_final_commit_for_site else '📝 普通提交，跳过自动部署')
+            # 被调用的发布流程会直接print，先刷出缓冲避免头部日志落到详细输出之后
+            _memory_handler.flush()
+
             # 使用当前标题
             title_obj = title_info['title_obj']
-            
+
             try:
-                
+
                 # 生成文章（只发布到指定仓库）
                 result = self.publish_article_to_specific_site(
                     title_obj, repo_id, repo_config, need_images, title_index, is_final_commit_for_site
                 )
-                
+
                 if result['success']:
                     site_stats[target_site]['published'] += 1
                     total_published += 1
                     used_titles_today.add(title_text)
-                    print(f"   ✅ 发布成功")
-                    
+                    logger.info("   ✅ 发布成功")
+
+                    # 成功即重置熔断计数；探测请求成功则关闭熔断恢复正常发布
+                    consecutive_failures = 0
+                    if breaker_half_open or breaker_open:
+                        logger.info("✅ 探测请求成功，熔断关闭，恢复正常发布")
+                        breaker_open = False
+                        breaker_half_open = False
+                        deferred_since_open = 0
+
+                    # 记录刚达标的网站，全部达标时无需再扫描剩余标题
+                    if site_stats[target_site]['published'] >= site_stats[target_site]['target']:
+                        sites_reached.add(target_site)
+
                     # 更新标题使用记录
                     title_obj['use_count'] = title_obj.get('use_count', 0) + 1
                     title_obj['last_used_at'] = datetime.now(beijing_tz).isoformat()
@@ -729,36 +916,61 @@ class PublishManager:
                     title_obj['published_to_repo'] = repo_id
                     title_obj['was_final_commit'] = is_final_commit_for_site
                     title_obj['title_index'] = title_index
-                    
-                    # 保存到KV存储
-                    self.save_to_kv(kv_key, processed_data)
-                    
+
+                    # 先写入O(1)的单标题增量记录保证崩溃可恢复
+                    self._save_title_delta(kv_key, title_obj)
+
+                    # 标记待保存，每隔若干篇checkpoint一次，避免每篇全量写KV
+                    kv_dirty = True
+                    if total_published % KV_CHECKPOINT_INTERVAL == 0:
+                        self.save_to_kv(kv_key, processed_data)
+                        kv_dirty = False
+
                 else:
                     site_stats[target_site]['failed'] += 1
                     total_failed += 1
-                    print(f"   ❌ 发布失败: {result.get('error', '未知错误')}")
-                    
+                    logger.info("   ❌ 发布失败: %s", result.get('error', '未知错误'))
+
             except ApiExhaustedRetriesError as e:
                 site_stats[target_site]['failed'] += 1
                 total_failed += 1
-                print(f"   💥 达到最大重试次数，提前终止: {str(e)}")
-                # 设置熔断标志
-                circuit_breaker_triggered = True
-                print("⛔ 发布流程提前结束，触发熔断机制")
-                print("🔥 熔断机制已触发，停止文章发布流程")
-                # 立即跳出循环，不再处理剩余标题
-                break
+                consecutive_failures += 1
+                logger.info("   💥 达到最大重试次数: %s", str(e))
+                # 探测失败或连续失败达到阈值时打开熔断，推迟后续标题但不终止整个批次
+                if breaker_half_open or consecutive_failures >= self.BREAKER_FAILURE_THRESHOLD:
+                    breaker_open = True
+                    breaker_half_open = False
+                    deferred_since_open = 0
+                    logger.info("⛔ 熔断打开，后续标题将推迟到下次运行（每 %s 个放行一次探测）", self.BREAKER_PROBE_DEFER_COUNT)
+                    # 打开熔断时先把未落盘的使用记录写入KV
+                    if kv_dirty:
+                        self.save_to_kv(kv_key, processed_data)
+                        kv_dirty = False
             except Exception as e:
                 site_stats[target_site]['failed'] += 1
                 total_failed += 1
-                print(f"   💥 发布异常: {str(e)}")
-        
-        # 检查是否触发了熔断机制
-        if circuit_breaker_triggered:
-            print("\n🔥 熔断机制已触发，停止文章发布流程")
+                logger.info("   💥 发布异常: %s", str(e))
+            finally:
+                # 每个标题处理完后把缓冲的日志批量刷出
+                _memory_handler.flush()
+
+        # 循环退出后刷掉最后一批缓冲日志，避免与后续print输出乱序
+        _memory_handler.flush()
+
+        # 循环结束后统一落盘剩余的使用记录
+        if kv_dirty:
+            self.save_to_kv(kv_key, processed_data)
+            kv_dirty = False
+
+        if deferred_count:
+            print(f"\n⏭️ 熔断期间推迟了 {deferred_count} 个标题，留待下次运行发布")
+
+        # 仅当运行结束时熔断仍处于打开状态（API始终未恢复）才上报熔断
+        if breaker_open:
+            print("\n🔥 运行结束时熔断仍未恢复，停止文章发布流程")
             # 抛出异常以触发工作流延迟机制
             raise ApiExhaustedRetriesError("🔥 API服务连续失败，触发熔断机制，请稍后重试")
-        
+
         # 输出发布统计
         print("\n=== 每日发布完成 ===")
         print(f"📊 总体统计:")
@@ -766,15 +978,17 @@ class PublishManager:
         print(f"  - 总发布失败: {total_failed}")
         
         print(f"\n📈 各网站统计:")
+        # 一次性取出所有网站的仓库信息，避免在打印循环里重复查询
+        repo_infos = [self.get_repository_for_site(i) for i in range(self.total_sites)]
         for site_index in range(self.total_sites):
             stats = site_stats[site_index]
-            repo_info = self.get_repository_for_site(site_index)
+            repo_info = repo_infos[site_index]
             repo_name = repo_info[1]['name'] if repo_info else f"网站{site_index}"
-            
+
             print(f"  - {repo_name}: {stats['published']}/{stats['target']} 成功, {stats['failed']} 失败")
         
-        # 检查是否所有网站都达到了目标数量
-        all_sites_reached_target = all(site_stats[i]['published'] >= site_stats[i]['target'] for i in range(self.total_sites))
+        # 检查是否所有网站都达到了目标数量（复用循环内维护的达标集合）
+        all_sites_reached_target = len(sites_reached) == self.total_sites
         
         if all_sites_reached_target:
             print("✅ 所有网站均已达到目标发布数量，任务完成")
@@ -847,15 +1061,57 @@ class PublishManager:
                 'error': str(e)
             }
     
+    # 生成缓存的存活时间（秒），覆盖一次失败重试周期即可
+    GENERATION_CACHE_TTL = 86400
+
+    def _generation_cache_key(self, keyword, lang_key, need_images, repo_name=None):
+        """根据关键词/语言/是否需要图片/目标仓库生成KV缓存键
+
+        内容是站点相关的（语言映射、图床域名都来自仓库配置），
+        仓库必须参与缓存键，避免重试换站点时串用其他站点的文章。
+        """
+        import hashlib
+        digest = hashlib.sha256(f"{keyword}|{lang_key}|{need_images}|{repo_name or ''}".encode()).hexdigest()
+        return f"gen:{digest}"
+
+    def _load_generation_cache(self, cache_key):
+        """读取生成缓存，文章目录已不在磁盘上时视为未命中"""
+        try:
+            cached_str = kv_read(self.account_id, self.namespace_id, self.api_token, cache_key, session=self.http)
+            if not isinstance(cached_str, str) or not cached_str:
+                return None
+            cached = json.loads(cached_str)
+            file_path = cached.get('file')
+            if not file_path or not Path(file_path).exists():
+                return None
+            return cached
+        except Exception:
+            return None
+
+    def _save_generation_cache(self, cache_key, file_path, primary_content=None, shared_image_data=None):
+        """缓存生成结果（带TTL），重试同一标题时跳过昂贵的LLM+图片流水线"""
+        try:
+            payload = {
+                'file': file_path,
+                'content': primary_content,
+                'image_data': shared_image_data,
+                'cached_at': datetime.now(beijing_tz).isoformat()
+            }
+            kv_write(self.account_id, self.namespace_id, self.api_token, cache_key,
+                     json.dumps(payload, ensure_ascii=False),
+                     expiration_ttl=self.GENERATION_CACHE_TTL, session=self.http)
+        except Exception as e:
+            print(f"    ⚠️ 保存生成缓存失败: {str(e)}")
+
     def generate_article_content_only(self, keyword, need_images=True, repo_name=None, repo_config=None):
         """只生成文章内容，不上传到任何仓库 - 使用翻译模式"""
         results = {}
         primary_content = None
-        
+
         # 获取所有语言代码
         from article_generator import LANGUAGES
         language_codes = list(LANGUAGES.keys())
-        
+
         # 从仓库配置中获取主语言，如果没有配置则使用默认值
         if repo_config and 'primary_language' in repo_config:
             primary_lang = repo_config['primary_language']
@@ -863,13 +1119,23 @@ class PublishManager:
         else:
             primary_lang = 'zh-cn'  # 默认主语言
             print(f"    使用默认主语言: {primary_lang}")
-        
-        # 首先生成主语言版本，获取内容和图片数据
-        print(f"    正在生成主语言 {LANGUAGES[primary_lang]} 版本...")
-        file_path, error, usage_record, primary_content, shared_image_data = self.article_generator.generate_markdown_for_language_with_content_and_images(
-            keyword, need_images, primary_lang, False, repo_name
-        )
-        
+
+        # 首先生成主语言版本，获取内容和图片数据（命中缓存时直接复用上次结果）
+        primary_cache_key = self._generation_cache_key(keyword, primary_lang, need_images, repo_name)
+        cached_primary = self._load_generation_cache(primary_cache_key)
+        if cached_primary and cached_primary.get('content'):
+            print(f"    ♻️ 命中生成缓存，跳过主语言 {LANGUAGES[primary_lang]} 版本重新生成")
+            file_path, error, usage_record = cached_primary['file'], None, None
+            primary_content = cached_primary['content']
+            shared_image_data = cached_primary.get('image_data')
+        else:
+            print(f"    正在生成主语言 {LANGUAGES[primary_lang]} 版本...")
+            file_path, error, usage_record, primary_content, shared_image_data = self.article_generator.generate_markdown_for_language_with_content_and_images(
+                keyword, need_images, primary_lang, False, repo_name
+            )
+            if primary_content and not error:
+                self._save_generation_cache(primary_cache_key, file_path, primary_content, shared_image_data)
+
         results[primary_lang] = {
             'file': file_path,
             'error': error,
@@ -881,105 +1147,181 @@ class PublishManager:
             print(f"    ❌ 主语言版本生成失败，无法继续生成其他语言版本")
             return results
         
-        # 为其他语言生成翻译版本
-        for lang_code in language_codes:
-            if lang_code == primary_lang:
-                continue  # 跳过主语言，已经生成了
-                
+        # 为其他语言并行生成翻译版本（纯I/O等待，串行只会叠加网络延迟）
+        import concurrent.futures
+
+        pending_langs = [lc for lc in language_codes if lc != primary_lang]
+        if not pending_langs:
+            return results
+
+        def _translate_one(lang_code):
+            # 翻译版本同样走生成缓存，重试时跳过翻译API调用
+            lang_cache_key = f"{primary_cache_key}:{lang_code}"
+            cached_lang = self._load_generation_cache(lang_cache_key)
+            if cached_lang:
+                print(f"    ♻️ 命中生成缓存，跳过翻译版本 {LANGUAGES[lang_code]} 重新生成")
+                return cached_lang['file'], None, None
+
+            # 令牌桶限流：只在翻译API配额耗尽时等待，突发请求不用排队
+            _translate_limiter.acquire()
             print(f"    正在生成翻译版本 {LANGUAGES[lang_code]}...")
-            
-            # 添加延迟避免翻译API限制
-            import time
-            time.sleep(1)
-            
             # 使用共享图片模式生成翻译文章
             file_path, error, usage_record = self.article_generator.generate_translated_markdown_with_shared_images(
                 keyword, need_images, lang_code, primary_content, shared_image_data, False, repo_name
             )
-            
-            results[lang_code] = {
-                'file': file_path,
-                'error': error,
-                'language': LANGUAGES[lang_code],
-                'usage_record': usage_record
-            }
-            
-            # 添加延迟避免API限制
-            if lang_code != language_codes[-1]:
-                time.sleep(1)
-        
+            if file_path and not error:
+                self._save_generation_cache(lang_cache_key, file_path)
+            return file_path, error, usage_record
+
+        translated = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(pending_langs)) as executor:
+            future_map = {executor.submit(_translate_one, lc): lc for lc in pending_langs}
+            for future in concurrent.futures.as_completed(future_map):
+                lang_code = future_map[future]
+                try:
+                    file_path, error, usage_record = future.result()
+                except ApiExhaustedRetriesError:
+                    # 熔断异常需要透传给上层处理
+                    raise
+                except Exception as e:
+                    file_path, error, usage_record = None, str(e), None
+
+                translated[lang_code] = {
+                    'file': file_path,
+                    'error': error,
+                    'language': LANGUAGES[lang_code],
+                    'usage_record': usage_record
+                }
+
+        # 按语言代码原始顺序写入结果，保持与串行版本一致的输出顺序
+        for lang_code in pending_langs:
+            if lang_code in translated:
+                results[lang_code] = translated[lang_code]
+
         return results
     
     def upload_to_specific_repository(self, results, repo_id, repo_config, is_final_commit=False):
-        """上传文章到指定仓库（每个语言版本分别上传）"""
+        """上传文章到指定仓库（所有语言版本合并为一次提交）"""
         upload_results = []
-        
+
         # 收集所有成功的语言版本
         successful_results = []
         for lang_code, result in results.items():
             if result['error'] or not result['file']:
                 continue
             successful_results.append((lang_code, result))
-        
+
         if not successful_results:
             print(f"     ❌ 没有成功的语言版本可以上传")
             return upload_results
-        
+
         if is_final_commit:
             print(f"     📤 上传所有语言版本到 {repo_config['name']} (最后一次提交，将触发自动部署)...")
         else:
             print(f"     📤 上传所有语言版本到 {repo_config['name']} (普通提交，跳过自动部署)...")
-        
+
         # 显示要上传的语言版本
         lang_names = [result['language'] for _, result in successful_results]
         print(f"     📝 包含语言版本: {', '.join(lang_names)}")
-        
-        # 为每个语言版本分别上传（但使用相同的is_final_commit状态）
-        for i, (lang_code, result) in enumerate(successful_results):
-            # 只有最后一个语言版本才触发自动部署
-            current_is_final_commit = is_final_commit and (i == len(successful_results) - 1)
-            
-            # 准备文章信息
+
+        # 把所有语言版本收集为一批文件，一次克隆/提交/推送完成上传
+        files_with_info = []
+        for lang_code, result in successful_results:
+            # 每个语言版本只构造一次Path对象
+            file_path = Path(result['file'])
             article_info = {
                 'title': 'Daily Publish Article',
                 'keyword': 'Daily Publish',
                 'game_name': '',
                 'custom_suffix': '',
                 'language': lang_code,
-                'folder_name': Path(result['file']).name,
+                'folder_name': file_path.name,
                 'need_images': True,
                 'file_path': result['file'],
-                'image_dir': str(Path(result['file']) / 'images')
+                'image_dir': str(file_path / 'images')
             }
-            
-            if current_is_final_commit:
-                print(f"     📤 上传 {result['language']} 版本到 {repo_config['name']} (最后一次提交，将触发自动部署)...")
-            else:
-                print(f"     📤 上传 {result['language']} 版本到 {repo_config['name']} (普通提交，跳过自动部署)...")
-            
-            # 上传到指定Git仓库
-            upload_result = self.article_generator.repo_manager.upload_to_git_repository(
-                result['file'], repo_config, article_info, repo_id, current_is_final_commit
-            )
-            
-            upload_results.append(upload_result)
-            
-            if upload_result['success']:
-                if current_is_final_commit:
-                    print(f"     ✅ 上传到 {repo_config['name']} 成功 (已触发自动部署)")
-                else:
-                    print(f"     ✅ 上传到 {repo_config['name']} 成功 (跳过自动部署)")
+            files_with_info.append((result['file'], article_info))
+
+        upload_result = self.article_generator.repo_manager.upload_batch_to_git_repository(
+            files_with_info, repo_config, repo_id, is_final_commit
+        )
+
+        upload_results.append(upload_result)
+
+        if upload_result['success']:
+            if is_final_commit:
+                print(f"     ✅ 上传到 {repo_config['name']} 成功 (已触发自动部署)")
             else:
-                print(f"     ❌ 上传到 {repo_config['name']} 失败: {upload_result['error']}")
-        
+                print(f"     ✅ 上传到 {repo_config['name']} 成功 (跳过自动部署)")
+        else:
+            print(f"     ❌ 上传到 {repo_config['name']} 失败: {upload_result['error']}")
+
         return upload_results
     
+    def _title_delta_key(self, kv_key, title_obj):
+        """单个标题增量记录在KV中的键（按标题文本哈希定位）"""
+        import hashlib
+        digest = hashlib.sha256(title_obj.get('title', '').encode()).hexdigest()[:16]
+        return f"title:{kv_key}:{digest}"
+
+    def _save_title_delta(self, kv_key, title_obj):
+        """只写入发生变化的单个标题记录（O(1)负载），全量数据留待批次末统一落盘"""
+        try:
+            if orjson is not None:
+                payload = orjson.dumps(title_obj).decode('utf-8')
+            else:
+                payload = json.dumps(title_obj, ensure_ascii=False)
+            delta_key = self._title_delta_key(kv_key, title_obj)
+            kv_write(self.account_id, self.namespace_id, self.api_token, delta_key, payload, session=self.http)
+            self._pending_delta_keys.add(delta_key)
+        except Exception as e:
+            print(f"    ⚠️ 保存标题增量记录失败: {str(e)}")
+
+    def _merge_title_deltas(self, kv_key, processed_data):
+        """把上次运行崩溃前写入、尚未并入全量数据的标题增量记录合并回来"""
+        try:
+            prefix = f"title:{kv_key}:"
+            delta_keys = kv_list_keys(self.account_id, self.namespace_id, self.api_token, prefix, session=self.http)
+            if not delta_keys:
+                return
+
+            deltas = {}
+            for key in delta_keys:
+                value = kv_read(self.account_id, self.namespace_id, self.api_token, key, session=self.http)
+                if isinstance(value, str) and value:
+                    deltas[key] = json.loads(value)
+
+            merged = 0
+            for page in processed_data.get('pages', {}).values():
+                for item in page.get('wordRankList', []):
+                    for title_obj in item.get('titles') or []:
+                        delta = deltas.get(self._title_delta_key(kv_key, title_obj))
+                        if delta:
+                            title_obj.update(delta)
+                            merged += 1
+
+            # 记下这些键，下次全量落盘成功后统一删除
+            self._pending_delta_keys.update(delta_keys)
+            if merged:
+                print(f"♻️ 已合并 {merged} 条上次运行的标题增量记录")
+        except Exception as e:
+            print(f"⚠️ 合并标题增量记录失败: {str(e)}")
+
     def save_to_kv(self, kv_key, processed_data):
         """保存数据到KV存储"""
         try:
-            kv_write(self.account_id, self.namespace_id, self.api_token, kv_key, 
-                    json.dumps(processed_data, ensure_ascii=False, indent=2))
+            # 优先使用orjson序列化；不缩进，KV中的数据只被程序读取
+            if orjson is not None:
+                payload = orjson.dumps(processed_data).decode('utf-8')
+            else:
+                payload = json.dumps(processed_data, ensure_ascii=False)
+            kv_write(self.account_id, self.namespace_id, self.api_token, kv_key, payload, session=self.http)
             print(f"    💾 数据已保存到KV存储")
+
+            # 全量数据已落盘，清理已并入的标题增量记录
+            for delta_key in list(self._pending_delta_keys):
+                kv_delete(self.account_id, self.namespace_id, self.api_token, delta_key, session=self.http)
+            self._pending_delta_keys.clear()
         except Exception as e:
             print(f"    ❌ 保存到KV存储失败: {str(e)}")
 
@@ -1,22 +1,112 @@
+import base64
+import functools
+import hashlib
 import os
+import requests
+import shlex
 import shutil
 import subprocess
+import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 import json
+import re
 from image_upload_manager import ImageUploadManager
 
+# 可选依赖：pygit2（libgit2绑定）可在进程内读取git对象，省去fork一个git进程的开销
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 # 定义北京时间时区
 beijing_tz = timezone(timedelta(hours=8))
 
+# 折叠路径中连续的斜杠（str.replace('//','/')无法处理三个以上连写的情况）
+_SLASH_RE = re.compile(r'/{2,}')
+
+
+@functools.lru_cache(maxsize=128)
+def _map_language(primary_language, language_code, mapping_items):
+    """语言代码映射（mapping_items需为排序元组以便缓存）"""
+    mapped_language = dict(mapping_items).get(language_code, language_code)
+    # 主语言不使用语言目录，非主语言使用对应的语言目录
+    language_path = "" if language_code == primary_language else mapped_language
+    return mapped_language, language_path
+
+
+def _fast_rmtree(path):
+    """用os.scandir递归删除目录，避免shutil.rmtree逐项重复stat的开销"""
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    _fast_rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+        os.rmdir(path)
+    except OSError:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _fast_copytree(src, dst):
+    """用系统原生命令复制目录（Windows robocopy / POSIX cp -a）
+
+    shutil.copytree 逐文件走Python层，在大目录和Windows上明显偏慢；
+    原生命令不可用或失败时回退到 shutil.copytree。
+    """
+    src = Path(src)
+    dst = Path(dst)
+    dst.mkdir(parents=True, exist_ok=True)
+    try:
+        if sys.platform == 'win32':
+            result = subprocess.run(
+                ['robocopy', str(src), str(dst), '/MT:16', '/E', '/NFL', '/NDL', '/NJH', '/NJS'],
+                capture_output=True)
+            # robocopy 返回码0-3都表示复制成功
+            if result.returncode <= 3:
+                return
+        else:
+            result = subprocess.run(['cp', '-a', f'{src}/.', str(dst)],
+                                    capture_output=True)
+            if result.returncode == 0:
+                return
+    except OSError:
+        pass
+    shutil.copytree(src, dst, dirs_exist_ok=True)
+
 class RepositoryManager:
     """多仓库管理器，负责将文章上传到不同的仓库"""
-    
+
+    # 裸仓库缓存目录：跨次运行复用已下载的对象，每次只做增量fetch
+    REPO_CACHE_DIR = Path(os.path.expanduser('~/.cache/ai-gen/repos'))
+
+    # 上传清单目录：记录每篇文章最近一次上传时的内容指纹，用于跳过无改动的重复上传
+    MANIFEST_CACHE_DIR = Path(os.path.expanduser('~/.cache/ai-gen/manifests'))
+
     def __init__(self, config_manager):
         self.config_manager = config_manager
         self.repositories = config_manager.config.get('repositories', {})
         self.image_upload_manager = ImageUploadManager(config_manager)
+        # 并行上传时串行化print输出，避免多线程日志交错
+        self._print_lock = threading.Lock()
+        # 图片处理会原地改写源README并向共享图床推送，
+        # 多仓库并行上传时必须串行化这一步，其余克隆/提交/推送仍可并行
+        self._image_processing_lock = threading.Lock()
+        # 后台删除线程池：把images目录清理移出提交关键路径
+        self._cleanup_executor = ThreadPoolExecutor(max_workers=2)
+        # 共享连接池的HTTP会话：所有GitHub API调用复用TLS连接，线程安全
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        ))
         
     def get_enabled_repositories(self):
         """获取所有启用的仓库配置"""
@@ -26,32 +116,27 @@ class RepositoryManager:
                 enabled_repos[repo_id] = repo_config
         return enabled_repos
     
-    def generate_target_path(self, repo_config, article_info):
-        """根据配置生成目标路径"""
+    def generate_target_path(self, repo_config, article_info, now=None):
+        """根据配置生成目标路径
+
+        批量上传时可传入统一的now，避免每篇文章重复取当前时间。
+        """
         path_template = repo_config.get('path_template', '{base_path}')
         base_path = repo_config.get('base_path', '')
         
         # 获取当前日期（使用北京时间）
-        now = datetime.now(beijing_tz)
+        if now is None:
+            now = datetime.now(beijing_tz)
         year = now.strftime('%Y')
         month = now.strftime('%m')
         day = now.strftime('%d')
         
-        # 语言代码映射
+        # 语言代码映射（查表结果按仓库配置缓存）
         language_code = article_info.get('language', 'zh-cn')
         language_mapping = repo_config.get('language_mapping', {})
-        mapped_language = language_mapping.get(language_code, language_code)
-        
-        # 获取主语言
         primary_language = repo_config.get('primary_language', 'zh-cn')
-        
-        # 确定语言路径
-        if language_code == primary_language:
-            # 主语言不使用语言目录
-            language_path = ""
-        else:
-            # 非主语言使用对应的语言目录
-            language_path = mapped_language
+        mapped_language, language_path = _map_language(
+            primary_language, language_code, tuple(sorted(language_mapping.items())))
         
         # 获取分类
         category = repo_config.get('category', 'articles')
@@ -72,8 +157,8 @@ class RepositoryManager:
             repo_name=repo_name
         )
         
-        # 清理路径中的双斜杠
-        target_path = target_path.replace('//', '/')
+        # 单次正则扫描折叠所有连续斜杠并去掉尾部斜杠
+        target_path = _SLASH_RE.sub('/', target_path).rstrip('/')
         
         return target_path
     
@@ -88,17 +173,19 @@ class RepositoryManager:
                 shutil.copy2(source_path, target_path)
             else:
                 # 如果是目录，复制除images文件夹外的所有内容
-                for item in source_path.iterdir():
-                    if item.name == 'images':
-                        # 跳过images文件夹
-                        print(f"      📁 跳过images文件夹: {item.name} (图片已上传到图床)")
-                        continue
-                    
-                    target_item = target_path / item.name
-                    if item.is_file():
-                        shutil.copy2(item, target_item)
-                    elif item.is_dir():
-                        shutil.copytree(item, target_item, dirs_exist_ok=True)
+                # os.scandir复用readdir返回的文件类型，免去逐项stat
+                with os.scandir(source_path) as entries:
+                    for entry in entries:
+                        if entry.name == 'images':
+                            # 跳过images文件夹
+                            print(f"      📁 跳过images文件夹: {entry.name} (图片已上传到图床)")
+                            continue
+
+                        target_item = target_path / entry.name
+                        if entry.is_file(follow_symlinks=False):
+                            shutil.copy2(entry.path, target_item)
+                        elif entry.is_dir(follow_symlinks=False):
+                            _fast_copytree(entry.path, target_item)
                         
         except Exception as e:
             print(f"      ❌ 复制文章文件失败: {e}")
@@ -108,8 +195,11 @@ class RepositoryManager:
             else:
                 shutil.copytree(source_path, target_path, dirs_exist_ok=True)
     
-    def upload_to_local_repository(self, source_path, repo_config, article_info, source_repo_info=None):
+    def upload_to_local_repository(self, source_path, repo_config, article_info, source_repo_info=None, now=None):
         """上传到本地仓库（备份远程仓库内容）"""
+        if now is None:
+            now = datetime.now(beijing_tz)
+        now_iso = now.isoformat()
         try:
             # 检查是否需要备份远程仓库
             backup_repos = repo_config.get('backup_repos', False)
@@ -119,7 +209,7 @@ class RepositoryManager:
                 source_repo_name = source_repo_info.get('name', 'unknown')
                 
                 # 使用源仓库的路径模板生成备份路径
-                source_target_path = self.generate_target_path(source_repo_info, article_info)
+                source_target_path = self.generate_target_path(source_repo_info, article_info, now=now)
                 
                 # 创建备份目录结构：logs/backup/源仓库名/源仓库路径结构
                 backup_base_path = f"{repo_config['base_path']}/backup/{source_repo_name}"
@@ -130,7 +220,7 @@ class RepositoryManager:
                 print(f"    📋 源路径: {source_target_path}")
             else:
                 # 普通模式：使用原有的路径生成逻辑
-                target_base_path = self.generate_target_path(repo_config, article_info)
+                target_base_path = self.generate_target_path(repo_config, article_info, now=now)
                 target_path = Path(target_base_path) / article_info['folder_name']
             
             # 确保目标目录存在
@@ -140,7 +230,7 @@ class RepositoryManager:
             if Path(source_path).is_file():
                 shutil.copy2(source_path, target_path)
             else:
-                shutil.copytree(source_path, target_path, dirs_exist_ok=True)
+                _fast_copytree(source_path, target_path)
             
             return {
                 'success': True,
@@ -150,7 +240,7 @@ class RepositoryManager:
                 'base_path': target_base_path,
                 'backup_mode': backup_repos and source_repo_info is not None,
                 'source_repo': source_repo_info.get('name', 'unknown') if source_repo_info else None,
-                'upload_time': datetime.now(beijing_tz).isoformat()
+                'upload_time': now_iso
             }
         except Exception as e:
             return {
@@ -158,36 +248,194 @@ class RepositoryManager:
                 'repo_id': 'local',
                 'repo_name': repo_config['name'],
                 'error': str(e),
-                'upload_time': datetime.now(beijing_tz).isoformat()
+                'upload_time': now_iso
             }
     
-    def upload_to_git_repository(self, source_path, repo_config, article_info, repo_id, is_final_commit=False, batch_articles=None):
+    def _compute_article_fingerprint(self, source_path):
+        """基于文件名/大小/mtime递归计算文章目录的内容指纹"""
+        digest = hashlib.blake2b(digest_size=16)
+
+        def feed(path):
+            try:
+                with os.scandir(path) as entries:
+                    for entry in sorted(entries, key=lambda e: e.name):
+                        stat = entry.stat(follow_symlinks=False)
+                        digest.update(f"{entry.name}|{stat.st_size}|{stat.st_mtime_ns}".encode('utf-8'))
+                        if entry.is_dir(follow_symlinks=False):
+                            feed(entry.path)
+            except OSError:
+                pass
+
+        source_path = Path(source_path)
+        if source_path.is_file():
+            stat = source_path.stat()
+            digest.update(f"{source_path.name}|{stat.st_size}|{stat.st_mtime_ns}".encode('utf-8'))
+        else:
+            feed(source_path)
+        return digest.hexdigest()
+
+    def _load_upload_manifest(self, manifest_key):
+        """读取指定仓库的上传清单（folder_name -> 指纹）"""
+        manifest_file = self.MANIFEST_CACHE_DIR / f"{manifest_key}.json"
+        try:
+            if manifest_file.exists():
+                with open(manifest_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception:
+            pass
+        return {}
+
+    def _save_upload_manifest(self, manifest_key, manifest):
+        """保存指定仓库的上传清单"""
+        try:
+            self.MANIFEST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            manifest_file = self.MANIFEST_CACHE_DIR / f"{manifest_key}.json"
+            with open(manifest_file, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"⚠️ 保存上传清单失败: {e}")
+
+    @staticmethod
+    def _strip_credentials(url):
+        """去掉URL中的userinfo（token）部分"""
+        return re.sub(r'^https://[^@/]+@', 'https://', url)
+
+    def _get_cached_repo(self, cache_key, clone_url, branch):
+        """获取（必要时创建）持久化的裸仓库缓存，并增量fetch目标分支到FETCH_HEAD
+
+        token只随每次fetch的显式URL传递，不落在缓存仓库的config里；
+        因此不用blob过滤（惰性取blob会走存储的origin URL，token轮换后会失效），
+        浅clone本身已经限制了缓存体积。
+        """
+        cache_path = self.REPO_CACHE_DIR / f"{cache_key}.git"
+        if cache_path.exists():
+            # 清理上次运行遗留的临时worktree记录
+            subprocess.run(['git', '-C', str(cache_path), 'worktree', 'prune'],
+                           capture_output=True)
+            fetch = subprocess.run(
+                ['git', '-C', str(cache_path), 'fetch', '--depth=1', clone_url, branch],
+                capture_output=True)
+            if fetch.returncode == 0:
+                return cache_path
+            # 缓存损坏或远端异常时删除重建
+            shutil.rmtree(cache_path, ignore_errors=True)
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        subprocess.run([
+            'git', 'clone', '--bare', '--depth=1',
+            '--branch', branch, clone_url, str(cache_path)
+        ], check=True, capture_output=True)
+        # clone会把带token的URL写进config，立即替换为无凭据URL
+        subprocess.run(
+            ['git', '-C', str(cache_path), 'remote', 'set-url', 'origin',
+             self._strip_credentials(clone_url)],
+            check=True, capture_output=True)
+        # 统一通过FETCH_HEAD引用最新提交
+        subprocess.run(
+            ['git', '-C', str(cache_path), 'fetch', '--depth=1', clone_url, branch],
+            check=True, capture_output=True)
+        return cache_path
+
+    def _copy_language_version(self, lang_info, article_target_path):
+        """复制单个语言版本到文章目录（单篇上传的并行工作单元）"""
+        lang_file_path = lang_info['file_path']
+        if not Path(lang_file_path).exists():
+            return
+
+        # 为其他语言版本创建子目录
+        lang_dir = article_target_path / lang_info['language']
+        lang_dir.mkdir(parents=True, exist_ok=True)
+
+        # 复制语言版本文件（包含images文件夹）
+        if Path(lang_file_path).is_file():
+            shutil.copy2(lang_file_path, lang_dir)
+        else:
+            _fast_copytree(lang_file_path, lang_dir)
+
+    def upload_to_git_repository(self, source_path, repo_config, article_info, repo_id, is_final_commit=False, batch_articles=None, now=None):
         """上传到Git仓库（支持批量上传多篇文章）"""
+        # 整个上传过程共用同一时间戳：目标路径日期与所有upload_time字段只计算一次
+        if now is None:
+            now = datetime.now(beijing_tz)
+        now_iso = now.isoformat()
         try:
+            # 内容指纹未变化时直接跳过整个克隆/提交/推送流程
+            article_fingerprint = None
+            if source_path and not batch_articles:
+                article_fingerprint = self._compute_article_fingerprint(source_path)
+                manifest = self._load_upload_manifest(repo_id)
+                folder_name = article_info.get('folder_name', 'article')
+                if manifest.get(folder_name) == article_fingerprint:
+                    print(f"    ⏭️  文章 {folder_name} 自上次上传后未变化，跳过上传")
+                    return {
+                        'success': True,
+                        'repo_id': repo_id,
+                        'repo_name': repo_config['name'],
+                        'repo_url': repo_config['url'],
+                        'skipped': True,
+                        'message': '内容未变化，跳过上传',
+                        'upload_time': now_iso
+                    }
+
             repo_url = repo_config['url']
             branch = repo_config.get('branch', 'main')
             auth_token = repo_config['auth']['token']
-            
+
+            # 单篇上传优先走GitHub git-data API直传，省掉克隆/检出/推送的整个磁盘流程；
+            # API出错时回退到下方的worktree方式
+            if source_path and not batch_articles:
+                try:
+                    api_result = self._upload_single_article_via_api(
+                        source_path, repo_config, article_info, repo_id,
+                        is_final_commit, now, now_iso)
+                except Exception as api_error:
+                    api_result = None
+                    print(f"    ⚠️  API直传失败，回退到git方式: {str(api_error)}")
+                if api_result is not None:
+                    # 直传成功同样更新上传清单，下次内容未变化时可跳过
+                    if article_fingerprint is not None:
+                        manifest = self._load_upload_manifest(repo_id)
+                        manifest[article_info.get('folder_name', 'article')] = article_fingerprint
+                        self._save_upload_manifest(repo_id, manifest)
+                    return api_result
+
             # 创建临时目录
             with tempfile.TemporaryDirectory() as temp_dir:
                 temp_path = Path(temp_dir)
                 repo_path = temp_path / "repo"
                 
-                # 克隆仓库
+                # 预先计算本次上传涉及的目标路径，用于稀疏检出
+                if batch_articles:
+                    sparse_paths = sorted({
+                        self.generate_target_path(repo_config, item['info'], now=now)
+                        for item in batch_articles
+                    })
+                else:
+                    sparse_paths = [self.generate_target_path(repo_config, article_info, now=now)]
+
+                # 复用裸仓库缓存：增量fetch后从FETCH_HEAD挂一个临时worktree，
+                # 结合稀疏检出只物化目标路径，避免每次上传重新克隆
                 clone_url = repo_url.replace('https://', f'https://{auth_token}@')
+                cache_path = self._get_cached_repo(repo_id, clone_url, branch)
+                # FETCH_HEAD是裸仓库自己的伪引用，在linked worktree里解析不到，
+                # 先在缓存仓库解析成SHA再用于挂载与检出
+                rev = subprocess.run(
+                    ['git', '-C', str(cache_path), 'rev-parse', 'FETCH_HEAD'],
+                    check=True, capture_output=True)
+                fetch_sha = rev.stdout.decode().strip()
                 subprocess.run([
-                    'git', 'clone', '--branch', branch, clone_url, str(repo_path)
+                    'git', '-C', str(cache_path), 'worktree', 'add',
+                    '--no-checkout', '--detach', str(repo_path), fetch_sha
                 ], check=True, capture_output=True)
-                
-                # 配置Git用户身份
                 subprocess.run([
-                    'git', 'config', 'user.email', 'ai-generator@github.com'
-                ], cwd=repo_path, check=True)
+                    'git', '-C', str(repo_path), 'sparse-checkout', 'set'
+                ] + sparse_paths, check=True, capture_output=True)
                 subprocess.run([
-                    'git', 'config', 'user.name', 'Action'
-                ], cwd=repo_path, check=True)
-                
+                    'git', '-C', str(repo_path), 'checkout', '--detach', fetch_sha
+                ], check=True, capture_output=True)
+
                 uploaded_articles = []
+                cleanup_futures = []
                 
                 # 如果是批量上传
                 if batch_articles:
@@ -199,7 +447,7 @@ class RepositoryManager:
                         article_data = batch_item['info']
                         
                         # 为每篇文章生成目标路径
-                        target_base_path = self.generate_target_path(repo_config, article_data)
+                        target_base_path = self.generate_target_path(repo_config, article_data, now=now)
                         article_target_path = repo_path / target_base_path / article_data['folder_name']
                         article_target_path.mkdir(parents=True, exist_ok=True)
                         
@@ -207,10 +455,13 @@ class RepositoryManager:
                         if Path(article_path).is_file():
                             shutil.copy2(article_path, article_target_path)
                         else:
-                            shutil.copytree(article_path, article_target_path, dirs_exist_ok=True)
+                            _fast_copytree(article_path, article_target_path)
                         
+                        # 暂存Path对象（含README/images），避免后续循环反复重建路径
                         uploaded_articles.append({
-                            'path': str(article_target_path),
+                            'path': article_target_path,
+                            'readme_path': article_target_path / 'README.md',
+                            'images_path': article_target_path / 'images',
                             'base_path': target_base_path,
                             'folder_name': article_data['folder_name'],
                             'original_path': article_path,
@@ -222,10 +473,11 @@ class RepositoryManager:
                     # 文章文件复制完成后，统一处理图片上传
                     print(f"    📸 开始批量处理所有文章的图片上传...")
                     
-                    # 使用批量图片上传方法
-                    batch_image_result = self.image_upload_manager.batch_upload_articles_images(
-                        uploaded_articles, repo_id, is_final_commit
-                    )
+                    # 使用批量图片上传方法（跨仓库并行时串行化图床访问）
+                    with self._image_processing_lock:
+                        batch_image_result = self.image_upload_manager.batch_upload_articles_images(
+                            uploaded_articles, repo_id, is_final_commit
+                        )
                     
                     if batch_image_result['success']:
                         if batch_image_result.get('uploaded_images'):
@@ -241,7 +493,7 @@ class RepositoryManager:
                                     print(f"      🔗 更新文章 {folder_name} 的图片链接: {len(article_images)} 张")
                                     
                                     # 更新文章内容中的图片链接
-                                    markdown_file = Path(uploaded_article['path']) / "README.md"
+                                    markdown_file = uploaded_article['readme_path']
                                     if markdown_file.exists():
                                         with open(markdown_file, 'r', encoding='utf-8') as f:
                                             content = f.read()
@@ -257,19 +509,26 @@ class RepositoryManager:
                                         
                                         print(f"        ✅ 已更新文章中的图片链接")
                                     
-                                    # 删除本地images文件夹，因为图片已上传到图床
-                                    images_dir = Path(uploaded_article['path']) / "images"
+                                    # 后台删除本地images文件夹，因为图片已上传到图床
+                                    images_dir = uploaded_article['images_path']
                                     if images_dir.exists():
-                                        shutil.rmtree(images_dir)
-                                        print(f"        🗑️  已删除本地images文件夹")
+                                        cleanup_futures.append(
+                                            self._cleanup_executor.submit(_fast_rmtree, str(images_dir)))
+                                        print(f"        🗑️  已调度删除本地images文件夹")
                         else:
                             print(f"    ℹ️  没有图片需要上传")
                     else:
                         print(f"    ⚠️  批量图片上传失败: {batch_image_result.get('error', '未知错误')}")
+
+                    # 返回结果只暴露字符串路径，Path对象仅在内部流转
+                    for uploaded_article in uploaded_articles:
+                        uploaded_article['path'] = str(uploaded_article['path'])
+                        uploaded_article.pop('readme_path', None)
+                        uploaded_article.pop('images_path', None)
                 
                 else:
                     # 单篇文章上传（修改后的逻辑）
-                    target_base_path = self.generate_target_path(repo_config, article_info)
+                    target_base_path = self.generate_target_path(repo_config, article_info, now=now)
                     article_target_path = repo_path / target_base_path / article_info['folder_name']
                     article_target_path.mkdir(parents=True, exist_ok=True)
                     
@@ -277,28 +536,23 @@ class RepositoryManager:
                     if Path(source_path).is_file():
                         shutil.copy2(source_path, article_target_path)
                     else:
-                        shutil.copytree(source_path, article_target_path, dirs_exist_ok=True)
+                        _fast_copytree(source_path, article_target_path)
                     
-                    # 复制其他语言版本文件
+                    # 并行复制其他语言版本文件（各语言目录互不重叠，复制是纯磁盘I/O）
                     additional_languages = article_info.get('additional_languages', [])
-                    for lang_info in additional_languages:
-                        lang_file_path = lang_info['file_path']
-                        if Path(lang_file_path).exists():
-                            # 为其他语言版本创建子目录
-                            lang_dir = article_target_path / lang_info['language']
-                            lang_dir.mkdir(parents=True, exist_ok=True)
-                            
-                            # 复制语言版本文件（包含images文件夹）
-                            if Path(lang_file_path).is_file():
-                                shutil.copy2(lang_file_path, lang_dir)
-                            else:
-                                shutil.copytree(lang_file_path, lang_dir, dirs_exist_ok=True)
+                    if additional_languages:
+                        with ThreadPoolExecutor(max_workers=min(8, len(additional_languages))) as executor:
+                            list(executor.map(
+                                lambda lang_info: self._copy_language_version(lang_info, article_target_path),
+                                additional_languages))
                     
                     # 文章文件复制完成后，处理图片上传
+                    # （原地改写源README且推送共享图床，跨仓库并行时必须串行）
                     print(f"    📸 处理文章图片: {article_info['folder_name']}")
-                    image_result = self.image_upload_manager.process_article_images(
-                        source_path, repo_id, article_info, is_final_commit
-                    )
+                    with self._image_processing_lock:
+                        image_result = self.image_upload_manager.process_article_images(
+                            source_path, repo_id, article_info, is_final_commit
+                        )
                     
                     if image_result['success'] and image_result.get('uploaded_images'):
                         print(f"    ✅ 图片已上传到图床: {len(image_result['uploaded_images'])} 张")
@@ -320,11 +574,12 @@ class RepositoryManager:
                             
                             print(f"    🔗 已更新文章中的图片链接")
                         
-                        # 删除本地images文件夹，因为图片已上传到图床
+                        # 后台删除本地images文件夹，因为图片已上传到图床
                         images_dir = article_target_path / "images"
                         if images_dir.exists():
-                            shutil.rmtree(images_dir)
-                            print(f"    🗑️  已删除本地images文件夹")
+                            cleanup_futures.append(
+                                self._cleanup_executor.submit(_fast_rmtree, str(images_dir)))
+                            print(f"    🗑️  已调度删除本地images文件夹")
                             
                     elif image_result['success']:
                         print(f"    ℹ️  文章无图片需要上传")
@@ -337,23 +592,6 @@ class RepositoryManager:
                         'folder_name': article_info['folder_name']
                     })
                 
-                # 提交更改
-                subprocess.run(['git', 'add', '.'], cwd=repo_path, check=True)
-                
-                # 检查是否有变更需要提交
-                result = subprocess.run(['git', 'status', '--porcelain'], cwd=repo_path, capture_output=True, text=True)
-                if not result.stdout.strip():
-                    print(f"    ⚠️  没有变更需要提交")
-                    return {
-                        'success': True,
-                        'repo_id': repo_config.get('id', 'unknown'),
-                        'repo_name': repo_config['name'],
-                        'repo_url': repo_url,
-                        'uploaded_articles': uploaded_articles,
-                        'upload_time': datetime.now(beijing_tz).isoformat(),
-                        'message': '没有变更需要提交'
-                    }
-                
                 # 根据是否为最后一次提交生成不同的提交信息
                 if batch_articles:
                     article_count = len(batch_articles)
@@ -371,13 +609,49 @@ class RepositoryManager:
                         commit_message = "🤖 自动上传文章 [skip ci]"
                         print(f"    📝 普通提交，跳过自动部署")
                 
-                subprocess.run([
-                    'git', 'commit', '-m', commit_message
-                ], cwd=repo_path, check=True)
-                
-                # 推送到远程仓库
-                subprocess.run(['git', 'push'], cwd=repo_path, check=True)
-                
+                # 等待后台删除完成，确保git暂存前images目录已经移除
+                for cleanup_future in cleanup_futures:
+                    cleanup_future.result()
+
+                # 单次shell调用串联 配置/暂存/变更检测/提交/推送，
+                # 避免逐条git命令的进程启动开销
+                # 只暂存本次上传涉及的目标路径，避免git add扫描整个工作区索引
+                add_pathspec = ' '.join(shlex.quote(p) for p in sparse_paths)
+                git_pipeline = (
+                    "git config user.email 'ai-generator@github.com' && "
+                    "git config user.name 'Action' && "
+                    f"git add -A -- {add_pathspec} && "
+                    "{ git diff --cached --quiet && echo NO_CHANGES || { "
+                    f"git commit -m {shlex.quote(commit_message)} && "
+                    # pack.threads=0用满CPU、低压缩档减少打包耗时；--atomic保证引用不会只推一半
+                    "git -c pack.threads=0 -c pack.windowMemory=256m -c core.compression=1 "
+                    f"push --atomic --no-verify {shlex.quote(clone_url)} HEAD:{shlex.quote(branch)}; }}; }}"
+                )
+                result = subprocess.run(git_pipeline, shell=True, cwd=repo_path,
+                                        check=True, capture_output=True)
+
+                # 移除临时worktree，缓存中的对象保留供下次复用
+                subprocess.run(['git', '-C', str(cache_path), 'worktree', 'remove',
+                                '--force', str(repo_path)], capture_output=True)
+
+                if b'NO_CHANGES' in result.stdout:
+                    print(f"    ⚠️  没有变更需要提交")
+                    return {
+                        'success': True,
+                        'repo_id': repo_config.get('id', 'unknown'),
+                        'repo_name': repo_config['name'],
+                        'repo_url': repo_url,
+                        'uploaded_articles': uploaded_articles,
+                        'upload_time': now_iso,
+                        'message': '没有变更需要提交'
+                    }
+
+                # 推送成功后更新上传清单，下次内容未变化时可跳过
+                if article_fingerprint is not None:
+                    manifest = self._load_upload_manifest(repo_id)
+                    manifest[article_info.get('folder_name', 'article')] = article_fingerprint
+                    self._save_upload_manifest(repo_id, manifest)
+
                 # 生成返回结果
                 if batch_articles:
                     return {
@@ -387,7 +661,7 @@ class RepositoryManager:
                         'repo_url': repo_url,
                         'uploaded_articles': uploaded_articles,
                         'batch_size': len(batch_articles),
-                        'upload_time': datetime.now(beijing_tz).isoformat()
+                        'upload_time': now_iso
                     }
                 else:
                     # 生成target_url
@@ -406,7 +680,7 @@ class RepositoryManager:
                         'target_path': str(uploaded_articles[0]['path']) if uploaded_articles else '',
                         'base_path': uploaded_articles[0]['base_path'] if uploaded_articles else '',
                         'target_url': target_url,
-                        'upload_time': datetime.now(beijing_tz).isoformat()
+                        'upload_time': now_iso
                     }
                 
         except subprocess.CalledProcessError as e:
@@ -417,7 +691,7 @@ class RepositoryManager:
                 'repo_name': repo_config['name'],
                 'repo_url': repo_config['url'],
                 'error': error_msg,
-                'upload_time': datetime.now(beijing_tz).isoformat()
+                'upload_time': now_iso
             }
         except Exception as e:
             return {
@@ -426,118 +700,402 @@ class RepositoryManager:
                 'repo_name': repo_config['name'],
                 'repo_url': repo_config['url'],
                 'error': str(e),
-                'upload_time': datetime.now(beijing_tz).isoformat()
+                'upload_time': now_iso
             }
     
+    def _upload_via_github_api(self, repo_config, article_target_files, commit_message):
+        """用git-data API把一组文件组装成一次提交并推进分支引用
+
+        流程：并行POST /git/blobs → POST /git/trees(base_tree=当前根树)
+        → POST /git/commits → PATCH /git/refs/heads/{branch}。
+        article_target_files为 (仓库内路径, 本地文件路径) 列表。
+        """
+        repo_url = repo_config['url']
+        branch = repo_config.get('branch', 'main')
+        auth_token = repo_config['auth']['token']
+
+        # 从仓库URL解析 owner/repo
+        owner_repo = repo_url.split('github.com/', 1)[1].rstrip('/')
+        if owner_repo.endswith('.git'):
+            owner_repo = owner_repo[:-4]
+        if owner_repo.count('/') != 1:
+            raise RuntimeError(f"无法从仓库URL解析owner/repo: {repo_url}")
+
+        api_base = f"https://api.github.com/repos/{owner_repo}"
+        headers = {'Authorization': f'token {auth_token}'}
+
+        def api_post(path, payload):
+            response = self.http.post(f"{api_base}{path}", headers=headers,
+                                      json=payload, timeout=30)
+            if response.status_code not in (200, 201):
+                raise RuntimeError(f"POST {path} 返回 {response.status_code}: {response.text[:200]}")
+            return response.json()
+
+        # 当前分支指向的提交及其根树
+        ref_response = self.http.get(f"{api_base}/git/ref/heads/{branch}",
+                                     headers=headers, timeout=15)
+        if ref_response.status_code != 200:
+            raise RuntimeError(f"读取分支引用失败: {ref_response.status_code}")
+        base_commit_sha = ref_response.json()['object']['sha']
+        commit_response = self.http.get(f"{api_base}/git/commits/{base_commit_sha}",
+                                        headers=headers, timeout=15)
+        if commit_response.status_code != 200:
+            raise RuntimeError(f"读取基础提交失败: {commit_response.status_code}")
+        base_tree_sha = commit_response.json()['tree']['sha']
+
+        # 并行创建blob，文件内容base64编码后上传
+        def create_blob(target_file):
+            target_path, local_path = target_file
+            with open(local_path, 'rb') as f:
+                encoded = base64.b64encode(f.read()).decode('ascii')
+            blob = api_post('/git/blobs', {'content': encoded, 'encoding': 'base64'})
+            return {'path': target_path, 'mode': '100644', 'type': 'blob', 'sha': blob['sha']}
+
+        with ThreadPoolExecutor(max_workers=min(8, len(article_target_files))) as executor:
+            tree_entries = list(executor.map(create_blob, article_target_files))
+
+        tree = api_post('/git/trees', {'base_tree': base_tree_sha, 'tree': tree_entries})
+        new_commit = api_post('/git/commits', {
+            'message': commit_message,
+            'tree': tree['sha'],
+            'parents': [base_commit_sha]
+        })
+
+        patch_response = self.http.patch(f"{api_base}/git/refs/heads/{branch}",
+                                         headers=headers,
+                                         json={'sha': new_commit['sha']}, timeout=15)
+        if patch_response.status_code != 200:
+            raise RuntimeError(f"更新分支引用失败: {patch_response.status_code}")
+        return new_commit['sha']
+
+    def _upload_single_article_via_api(self, source_path, repo_config, article_info, repo_id, is_final_commit, now, now_iso):
+        """单篇文章免克隆直传：收集目标文件后交给git-data API组装提交
+
+        非GitHub仓库返回None，由调用方继续走worktree上传。
+        """
+        repo_url = repo_config['url']
+        if 'github.com' not in repo_url:
+            return None
+
+        target_base_path = self.generate_target_path(repo_config, article_info, now=now)
+        folder_name = article_info['folder_name']
+        article_prefix = f"{target_base_path}/{folder_name}"
+
+        # 与worktree路径一致：先把图片传到图床并改写README中的链接
+        # （原地改写源README且推送共享图床，跨仓库并行时必须串行）
+        print(f"    📸 处理文章图片: {folder_name}")
+        with self._image_processing_lock:
+            image_result = self.image_upload_manager.process_article_images(
+                source_path, repo_id, article_info, is_final_commit
+            )
+        skip_images = bool(image_result['success'] and image_result.get('uploaded_images'))
+        if skip_images:
+            print(f"    ✅ 图片已上传到图床: {len(image_result['uploaded_images'])} 张")
+        elif image_result['success']:
+            print(f"    ℹ️  文章无图片需要上传")
+        else:
+            print(f"    ⚠️  图片上传失败: {image_result.get('error', '未知错误')}")
+
+        article_target_files = []
+
+        def collect_files(base_dir, prefix, exclude_images):
+            base = Path(base_dir)
+            if base.is_file():
+                article_target_files.append((f"{prefix}/{base.name}", str(base)))
+                return
+            for root, dirs, files in os.walk(base):
+                # 图片已在图床，顶层images文件夹不入库
+                if exclude_images and Path(root) == base and 'images' in dirs:
+                    dirs.remove('images')
+                for name in files:
+                    local_path = Path(root) / name
+                    rel = local_path.relative_to(base).as_posix()
+                    article_target_files.append((f"{prefix}/{rel}", str(local_path)))
+
+        collect_files(source_path, article_prefix, skip_images)
+        for lang_info in article_info.get('additional_languages', []):
+            if Path(lang_info['file_path']).exists():
+                collect_files(lang_info['file_path'],
+                              f"{article_prefix}/{lang_info['language']}", False)
+
+        if not article_target_files:
+            return None
+
+        if is_final_commit:
+            commit_message = "🤖 自动上传文章"
+            print(f"    🚀 最后一次提交，开启自动部署")
+        else:
+            commit_message = "🤖 自动上传文章 [skip ci]"
+            print(f"    📝 普通提交，跳过自动部署")
+
+        self._upload_via_github_api(repo_config, article_target_files, commit_message)
+        print(f"    ⚡ 已通过GitHub API直传 {len(article_target_files)} 个文件（免克隆）")
+
+        domain = repo_config.get('domain', '')
+        if domain:
+            target_url = f"https://{domain}/{target_base_path}/{folder_name}/"
+        else:
+            target_url = None
+
+        return {
+            'success': True,
+            'repo_id': repo_id,
+            'repo_name': repo_config['name'],
+            'repo_url': repo_url,
+            'target_path': article_prefix,
+            'base_path': target_base_path,
+            'target_url': target_url,
+            'upload_time': now_iso
+        }
+
+    def upload_batch_to_git_repository(self, files_with_info, repo_config, repo_id, is_final_commit=False):
+        """将多个文件（如同一文章的各语言版本）合并为一次提交上传到Git仓库
+
+        相比逐文件调用 upload_to_git_repository，只执行一次克隆/提交/推送。
+        """
+        batch_articles = [
+            {'path': file_path, 'info': article_info}
+            for file_path, article_info in files_with_info
+        ]
+        return self.upload_to_git_repository(
+            source_path=None,
+            repo_config=repo_config,
+            article_info={},
+            repo_id=repo_id,
+            is_final_commit=is_final_commit,
+            batch_articles=batch_articles
+        )
+
+    def upload_articles_batch(self, article_list, is_final_commit=False):
+        """将多篇文章批量上传到所有启用的仓库
+
+        每个Git仓库只执行一次克隆/提交/推送（复用batch_articles路径），
+        代替逐篇调用 upload_article_to_all_repositories 时的N次克隆。
+        article_list元素为 {'source_path': 路径, 'info': 文章信息} 字典。
+        """
+        enabled_repos = self.get_enabled_repositories()
+        upload_results = []
+        if not article_list or not enabled_repos:
+            return upload_results
+
+        print(f"📤 开始批量上传 {len(article_list)} 篇文章到 {len(enabled_repos)} 个仓库...")
+        run_now = datetime.now(beijing_tz)
+        batch_articles = [
+            {'path': article['source_path'], 'info': article['info']}
+            for article in article_list
+        ]
+        git_repos = [repo for repo in enabled_repos.values() if repo['type'] == 'git']
+
+        for repo_id, repo_config in enabled_repos.items():
+            print(f"  📁 批量上传到 {repo_config['name']} ({repo_config['type']})...")
+
+            if repo_config['type'] == 'git':
+                result = self.upload_to_git_repository(
+                    source_path=None,
+                    repo_config=repo_config,
+                    article_info=article_list[0]['info'],
+                    repo_id=repo_id,
+                    is_final_commit=is_final_commit,
+                    batch_articles=batch_articles,
+                    now=run_now
+                )
+                upload_results.append(result)
+            elif repo_config['type'] == 'local':
+                # 本地备份没有克隆/推送开销，逐篇复制即可
+                source_repo_info = git_repos[0] if git_repos else None
+                for article in article_list:
+                    upload_results.append(self.upload_to_local_repository(
+                        article['source_path'], repo_config, article['info'], source_repo_info,
+                        now=run_now))
+            else:
+                upload_results.append({
+                    'success': False,
+                    'repo_id': repo_id,
+                    'repo_name': repo_config['name'],
+                    'error': f"不支持的仓库类型: {repo_config['type']}",
+                    'upload_time': run_now.isoformat()
+                })
+
+        return upload_results
+
     def upload_article_to_all_repositories(self, source_path, article_info, is_final_commit=False):
         """将文章上传到所有启用的仓库"""
         enabled_repos = self.get_enabled_repositories()
         upload_results = []
-        
+        if not enabled_repos:
+            return upload_results
+
         print(f"📤 开始上传文章到 {len(enabled_repos)} 个仓库...")
+        run_now = datetime.now(beijing_tz)
         
         # 统计Git仓库数量
         git_repos = [repo for repo in enabled_repos.values() if repo['type'] == 'git']
         if git_repos and is_final_commit:
             print(f"🚀 这是最后一次提交，{len(git_repos)} 个Git仓库将开启自动部署")
         
-        for repo_id, repo_config in enabled_repos.items():
+        # 各仓库之间无共享可变状态，按仓库并行上传（主要耗时在网络/磁盘I/O）
+        with ThreadPoolExecutor(max_workers=min(8, len(enabled_repos))) as executor:
+            futures = {
+                executor.submit(self._upload_one, repo_id, repo_config, source_path,
+                                article_info, is_final_commit, enabled_repos, run_now): repo_id
+                for repo_id, repo_config in enabled_repos.items()
+            }
+            for future in as_completed(futures):
+                upload_results.append(future.result())
+
+        return upload_results
+
+    def _upload_one(self, repo_id, repo_config, source_path, article_info, is_final_commit, enabled_repos, now=None):
+        """上传文章到单个仓库（upload_article_to_all_repositories 的并行工作单元）"""
+        with self._print_lock:
             print(f"  📁 上传到 {repo_config['name']} ({repo_config['type']})...")
-            
-            if repo_config['type'] == 'local':
-                # 检查是否有其他Git仓库需要备份
-                git_repos = [repo for repo in enabled_repos.values() if repo['type'] == 'git']
-                if git_repos:
-                    # 如果有Git仓库，本地仓库将作为备份
-                    source_repo_info = git_repos[0]  # 使用第一个Git仓库作为源
-                    result = self.upload_to_local_repository(source_path, repo_config, article_info, source_repo_info)
-                else:
-                    # 没有Git仓库时，使用普通模式
-                    result = self.upload_to_local_repository(source_path, repo_config, article_info)
-            elif repo_config['type'] == 'git':
-                result = self.upload_to_git_repository(source_path, repo_config, article_info, repo_id, is_final_commit)
+
+        if repo_config['type'] == 'local':
+            # 检查是否有其他Git仓库需要备份
+            git_repos = [repo for repo in enabled_repos.values() if repo['type'] == 'git']
+            if git_repos:
+                # 如果有Git仓库，本地仓库将作为备份
+                source_repo_info = git_repos[0]  # 使用第一个Git仓库作为源
+                result = self.upload_to_local_repository(source_path, repo_config, article_info, source_repo_info, now=now)
             else:
-                result = {
-                    'success': False,
-                    'repo_id': repo_id,
-                    'repo_name': repo_config['name'],
-                    'error': f"不支持的仓库类型: {repo_config['type']}",
-                    'upload_time': datetime.now(beijing_tz).isoformat()
-                }
-            
-            upload_results.append(result)
-            
+                # 没有Git仓库时，使用普通模式
+                result = self.upload_to_local_repository(source_path, repo_config, article_info, now=now)
+        elif repo_config['type'] == 'git':
+            result = self.upload_to_git_repository(source_path, repo_config, article_info, repo_id, is_final_commit, now=now)
+        else:
+            result = {
+                'success': False,
+                'repo_id': repo_id,
+                'repo_name': repo_config['name'],
+                'error': f"不支持的仓库类型: {repo_config['type']}",
+                'upload_time': (now or datetime.now(beijing_tz)).isoformat()
+            }
+
+        with self._print_lock:
             if result['success']:
-                print(f"    ✅ 上传成功: {result['target_path']}")
+                print(f"    ✅ 上传成功: {result.get('target_path', '')}")
             else:
                 print(f"    ❌ 上传失败: {result['error']}")
-        
-        return upload_results
+        return result
     
-    def query_remote_repository_folders(self, repo_config, target_date=None):
+    def _ls_tree_dirs(self, repo_path, rel_path, rev='HEAD'):
+        """列出指定提交树中某路径下的子目录名（不依赖工作区检出）
+
+        优先用pygit2在进程内读取树对象；不可用或读取失败时回退到子进程git。
+        """
+        if pygit2 is not None:
+            try:
+                repo = pygit2.Repository(str(repo_path))
+                tree = repo.revparse_single(rev).peel(pygit2.Tree)
+                for part in (rel_path or '').strip('/').split('/'):
+                    if not part:
+                        continue
+                    tree = repo[tree[part].id]
+                return [entry.name for entry in tree
+                        if entry.filemode == pygit2.GIT_FILEMODE_TREE]
+            except KeyError:
+                # 路径在该提交的树中不存在
+                return []
+            except Exception:
+                # pygit2读取异常时回退到子进程git
+                pass
+
+        cmd = ['git', '-C', str(repo_path), 'ls-tree', '-d', '--name-only', rev]
+        if rel_path:
+            cmd.append(rel_path.rstrip('/') + '/')
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            return []
+        return [line.rsplit('/', 1)[-1] for line in result.stdout.splitlines() if line.strip()]
+
+    def _query_remote_folders_via_api(self, repo_config, year, month, day):
+        """通过GitHub Contents API查询目录列表，单次HTTP调用代替克隆仓库
+
+        非GitHub仓库返回None，由调用方回退到git查询。
+        """
+        repo_url = repo_config['url']
+        if 'github.com' not in repo_url:
+            return None
+
+        branch = repo_config.get('branch', 'main')
+        auth_token = repo_config['auth']['token']
+        base_path = repo_config.get('base_path', '')
+        category = repo_config.get('category', 'articles')
+
+        # 从仓库URL解析 owner/repo
+        owner_repo = repo_url.split('github.com/', 1)[1].rstrip('/')
+        if owner_repo.endswith('.git'):
+            owner_repo = owner_repo[:-4]
+        if owner_repo.count('/') != 1:
+            return None
+
+        headers = {'Authorization': f'token {auth_token}'}
+
+        def list_dirs(path):
+            url = f"https://api.github.com/repos/{owner_repo}/contents/{path}?ref={branch}"
+            response = self.http.get(url, headers=headers, timeout=15)
+            if response.status_code == 404:
+                # 路径不存在（当天还没有发布），视为空目录
+                return []
+            if response.status_code != 200:
+                raise RuntimeError(f"Contents API返回 {response.status_code}")
+            return [entry['name'] for entry in response.json() if entry.get('type') == 'dir']
+
+        # 先枚举语言目录，再逐个读取当天的文章目录
+        lang_dirs = list_dirs(base_path)
+        article_titles = set()
+        for lang_name in lang_dirs:
+            day_rel = '/'.join(p for p in [base_path, lang_name, category, year, month, day] if p)
+            article_titles.update(list_dirs(day_rel))
+        return len(article_titles)
+
+    def query_remote_repository_folders(self, repo_config, target_date=None, repo_id=None):
         """查询远程仓库指定日期的文件夹数量"""
+        # 如果没有指定日期，使用今天
+        if target_date is None:
+            now = datetime.now(beijing_tz)
+            year = now.strftime('%Y')
+            month = now.strftime('%m')
+            day = now.strftime('%d')
+        else:
+            year = target_date.strftime('%Y')
+            month = target_date.strftime('%m')
+            day = target_date.strftime('%d')
+
+        # 优先走Contents API：一次HTTP调用即可拿到目录列表
+        try:
+            api_count = self._query_remote_folders_via_api(repo_config, year, month, day)
+            if api_count is not None:
+                return api_count
+        except Exception as e:
+            print(f"⚠️ Contents API查询失败，回退到git查询: {str(e)}")
+
         try:
             repo_url = repo_config['url']
             branch = repo_config.get('branch', 'main')
             auth_token = repo_config['auth']['token']
-            
-            # 如果没有指定日期，使用今天
-            if target_date is None:
-                now = datetime.now(beijing_tz)
-                year = now.strftime('%Y')
-                month = now.strftime('%m')
-                day = now.strftime('%d')
-            else:
-                year = target_date.strftime('%Y')
-                month = target_date.strftime('%m')
-                day = target_date.strftime('%d')
-            
-            # 创建临时目录
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                repo_path = temp_path / "repo"
-                
-                # 克隆仓库
-                clone_url = repo_url.replace('https://', f'https://{auth_token}@')
-                subprocess.run([
-                    'git', 'clone', '--branch', branch, clone_url, str(repo_path)
-                ], check=True, capture_output=True)
-                
-                # 生成目标路径
-                base_path = repo_config.get('base_path', '')
-                category = repo_config.get('category', 'articles')
-                
-                # 构建目标路径：base_path/{year}/{month}/{day} 或 base_path/zh-CN/{year}/{month}/{day}
-                target_path = Path(repo_path) / base_path
-                
-                # 查找所有符合日期模式的目录
-                day_dirs = []
-                for lang_dir in target_path.iterdir():
-                    if lang_dir.is_dir():
-                        # 检查是否为主语言目录（没有语言前缀）
-                        primary_language = repo_config.get('primary_language', 'zh-tw')
-                        if lang_dir.name == primary_language or lang_dir.name == '':
-                            # 主语言目录
-                            day_path = lang_dir / category / year / month / day
-                            if day_path.exists():
-                                day_dirs.append(day_path)
-                        else:
-                            # 非主语言目录
-                            day_path = lang_dir / category / year / month / day
-                            if day_path.exists():
-                                day_dirs.append(day_path)
-                
-                # 收集所有文章标题，去重以避免重复计算多语言版本
-                article_titles = set()
-                for day_dir in day_dirs:
-                    if day_dir.is_dir():
-                        # 收集文章目录名称
-                        for article_dir in day_dir.iterdir():
-                            if article_dir.is_dir():
-                                article_titles.add(article_dir.name)
-                
-                return len(article_titles)
-                
+
+            # 复用裸仓库缓存，增量fetch后直接读FETCH_HEAD的树对象，无需任何检出
+            clone_url = repo_url.replace('https://', f'https://{auth_token}@')
+            # 与上传路径使用同一个缓存键（repo_id），避免同一仓库出现两份裸缓存
+            cache_path = self._get_cached_repo(
+                repo_id or repo_config.get('name', 'repo'), clone_url, branch)
+
+            # 生成目标路径
+            base_path = repo_config.get('base_path', '')
+            category = repo_config.get('category', 'articles')
+
+            # 用 git ls-tree 直接读取树对象，代替遍历检出后的工作区
+            lang_dirs = self._ls_tree_dirs(cache_path, base_path, rev='FETCH_HEAD')
+
+            # 收集所有文章标题，去重以避免重复计算多语言版本
+            article_titles = set()
+            for lang_name in lang_dirs:
+                day_rel = '/'.join(p for p in [base_path, lang_name, category, year, month, day] if p)
+                article_titles.update(self._ls_tree_dirs(cache_path, day_rel, rev='FETCH_HEAD'))
+
+            return len(article_titles)
+
         except subprocess.CalledProcessError as e:
             print(f"❌ 查询远程仓库失败: {e.stderr.decode() if e.stderr else str(e)}")
             return 0
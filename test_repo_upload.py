@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+测试Git仓库上传流程（针对本地file://远程端到端验证）
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from repo_manager import RepositoryManager
+
+
+class _StubConfigManager:
+    """仅提供config字典的最小配置管理器替身"""
+
+    def __init__(self, config):
+        self.config = config
+
+
+def _run_git(args, cwd=None):
+    subprocess.run(['git'] + args, cwd=cwd, check=True, capture_output=True)
+
+
+def test_upload_to_git_repository_local_remote():
+    """端到端：上传一篇文章到本地file://裸仓库并确认提交落地"""
+    base_dir = tempfile.mkdtemp(prefix='repo_upload_test_')
+    try:
+        # 1. 准备带初始提交的裸远程仓库
+        seed_path = os.path.join(base_dir, 'seed')
+        _run_git(['init', '-q', '-b', 'main', seed_path])
+        Path(seed_path, '.gitkeep').write_text('')
+        _run_git(['add', '.gitkeep'], cwd=seed_path)
+        _run_git(['-c', 'user.email=test@example.com', '-c', 'user.name=Test',
+                  'commit', '-q', '-m', 'init'], cwd=seed_path)
+        origin_path = os.path.join(base_dir, 'origin.git')
+        _run_git(['clone', '-q', '--bare', seed_path, origin_path])
+
+        # 2. 准备待上传的文章目录（无图片，跳过图床流程）
+        article_path = Path(base_dir) / 'article'
+        article_path.mkdir()
+        (article_path / 'README.md').write_text('# 测试文章\n\n正文内容。\n', encoding='utf-8')
+
+        # 3. 缓存目录重定向到临时目录，避免污染~/.cache
+        RepositoryManager.REPO_CACHE_DIR = Path(base_dir) / 'repo_cache'
+        RepositoryManager.MANIFEST_CACHE_DIR = Path(base_dir) / 'manifest_cache'
+
+        repo_config = {
+            'name': 'test-repo',
+            'type': 'git',
+            'enabled': True,
+            'url': f'file://{origin_path}',
+            'branch': 'main',
+            'base_path': 'articles',
+            'auth': {'token': 'dummy'},
+        }
+        manager = RepositoryManager(_StubConfigManager({'repositories': {'test_repo': repo_config}}))
+
+        article_info = {'folder_name': 'test-article', 'language': 'zh-cn'}
+        result = manager.upload_to_git_repository(
+            str(article_path), repo_config, article_info, 'test_repo')
+
+        print(f"上传结果: {result}")
+        assert result['success'], f"上传失败: {result.get('error')}"
+        assert not result.get('skipped'), "首次上传不应命中指纹跳过"
+
+        # 4. 确认提交真的推送到了远程
+        listing = subprocess.run(
+            ['git', '-C', origin_path, 'ls-tree', '-r', 'main', '--name-only'],
+            check=True, capture_output=True)
+        files = listing.stdout.decode().splitlines()
+        print(f"远程文件列表: {files}")
+        assert 'articles/test-article/README.md' in files, "文章未出现在远程仓库中"
+
+        # 5. 内容未变化时第二次上传应命中指纹缓存直接跳过
+        result_again = manager.upload_to_git_repository(
+            str(article_path), repo_config, article_info, 'test_repo')
+        assert result_again['success']
+        assert result_again.get('skipped'), "内容未变化的重复上传应被跳过"
+
+        print("✅ Git仓库上传端到端测试通过")
+    finally:
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_upload_to_git_repository_local_remote()